@@ -0,0 +1,322 @@
+"""
+Utilization analytics across stored timetables.
+
+Every generated timetable is stored as one JSON file under
+TIMETABLE_DIR/<term>/<section>.json (see save_timetable(); app3.py's upload
+and decompose.py both do this):
+
+    {"section": "CSE-IV-C104", "term": "Jan - April 2025", "timetable": {...},
+     "color_map": {...}, "report": {...}, "room": "C104", "rooms": {"CS206": "C203"}}
+
+"room" is the section's classroom and "rooms" the courses taught elsewhere.
+load() stacks all stored timetables into dense arrays over
+section x day x slot. The slot axis is the union of every section's slots,
+in time order:
+
+    kind[s, d, t]     ABSENT (slot not in that section's day), EMPTY, LECTURE,
+                      TUTORIAL, LAB, ELECTIVE, HS205 or BREAK
+    course[s, d, t]   index into "courses", -1 for no course
+    room[s, d, t]     index into "rooms" for lectures and tutorials, else -1
+
+The views below reduce those arrays with whole-array NumPy operations, so a
+few hundred sections over several terms are summarized in milliseconds:
+
+  heatmap       share of sections teaching in each (day, slot)
+  days          teaching hours per day: mean / min / max over sections
+  section_load  teaching hours per day of each section
+  labs          per term: lab sessions running at once in each (day, slot)
+  rooms         per term and room: busy cells, utilization and clashes
+  courses       per course: sections, sessions, days per week, most sessions on one day
+
+    python analytics.py --term "Jan - April 2025" --view heatmap --csv -
+"""
+import argparse
+import csv
+import glob
+import json
+import os
+import re
+import sys
+
+import numpy as np
+
+from scheduler import DAYS, slot_bounds_24h
+from validator import classify
+
+TIMETABLE_DIR = os.path.join("uploads", "timetables")
+
+DEFAULT_SLOT_HOURS = 1.0  # length assumed for slots that are not in 24h form
+
+# Values of the kind array
+ABSENT, EMPTY, LECTURE, TUTORIAL, LAB, ELECTIVE, HS205, BREAK = range(-1, 7)
+KIND_CODES = {"lecture": LECTURE, "tutorial": TUTORIAL, "lab": LAB, "elective": ELECTIVE, "hs205": HS205}
+BREAKS = ("Morning Break", "Lunch Break")
+TEACHING = [LECTURE, TUTORIAL, LAB, ELECTIVE, HS205]
+
+_loaded = {}  # root -> (signature of the stored files, stack)
+
+
+def _safe_name(name):
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", str(name)).strip("_") or "untitled"
+
+
+def save_timetable(section, term, timetable, color_map, report, room=None, rooms=None,
+                   root=TIMETABLE_DIR):
+    """
+    Store one section's timetable for the analytics. Returns the file path.
+    """
+    out_dir = os.path.join(root, _safe_name(term)) if term else root
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, _safe_name(section) + ".json")
+    with open(path, "w") as fh:
+        json.dump({"section": section, "term": term, "timetable": timetable, "color_map": color_map,
+                   "report": report, "room": room, "rooms": rooms or {}}, fh, indent=1)
+    return path
+
+
+def _slot_order(label):
+    bounds = slot_bounds_24h(label)
+    return (bounds is None, bounds[0] if bounds else 0.0, label)
+
+
+def stack_timetables(records):
+    """
+    Build the section x day x slot arrays (see the module docstring) from
+    stored timetable dicts.
+    """
+    labels = set()
+    for rec in records:
+        for cells in rec["timetable"].values():
+            labels.update(cells)
+    slots = sorted(labels, key=_slot_order)
+    slot_index = {label: i for i, label in enumerate(slots)}
+    hours = np.array([(b[1] - b[0]) if b else DEFAULT_SLOT_HOURS
+                      for b in map(slot_bounds_24h, slots)], dtype=np.float32)
+
+    shape = (len(records), len(DAYS), len(slots))
+    kind = np.full(shape, ABSENT, dtype=np.int8)
+    course = np.full(shape, -1, dtype=np.int32)
+    room = np.full(shape, -1, dtype=np.int32)
+    course_index = {}
+    room_index = {}
+    parsed = {}  # cell label -> (kind, code)
+
+    for s, rec in enumerate(records):
+        default_room = rec.get("room")
+        course_rooms = rec.get("rooms") or {}
+        for d, day in enumerate(DAYS):
+            for label, val in rec["timetable"].get(day, {}).items():
+                t = slot_index[label]
+                if not val:
+                    kind[s, d, t] = EMPTY
+                    continue
+                if val not in parsed:
+                    code, k = classify(val)
+                    parsed[val] = (BREAK, None) if val in BREAKS else (
+                        KIND_CODES[k], None if k == "elective" else code)
+                k, code = parsed[val]
+                kind[s, d, t] = k
+                if code is None:
+                    continue
+                course[s, d, t] = course_index.setdefault(code, len(course_index))
+                where = course_rooms.get(code, default_room)
+                if where and k in (LECTURE, TUTORIAL):
+                    room[s, d, t] = room_index.setdefault(where, len(room_index))
+
+    return {
+        "sections": [rec["section"] for rec in records],
+        "terms": np.array([rec.get("term") or "" for rec in records], dtype=object),
+        "slots": slots,
+        "slot_hours": hours,
+        "courses": list(course_index),
+        "rooms": list(room_index),
+        "kind": kind,
+        "course": course,
+        "room": room,
+    }
+
+
+def load(root=TIMETABLE_DIR):
+    """
+    Stack every timetable stored under `root`. The stack is kept in memory
+    and rebuilt only when a file is added, removed or rewritten.
+    """
+    paths = sorted(glob.glob(os.path.join(root, "**", "*.json"), recursive=True))
+    signature = tuple((p, os.stat(p).st_mtime_ns) for p in paths)
+    cached = _loaded.get(root)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    records = []
+    for p in paths:
+        with open(p) as fh:
+            records.append(json.load(fh))
+    stack = stack_timetables(records)
+    _loaded[root] = (signature, stack)
+    return stack
+
+
+def select(stack, term=None):
+    """
+    The part of `stack` for one term (all of it for term=None).
+    """
+    if term is None:
+        return stack
+    keep = stack["terms"] == term
+    picked = dict(stack)
+    picked["sections"] = [name for name, k in zip(stack["sections"], keep) if k]
+    for key in ("terms", "kind", "course", "room"):
+        picked[key] = stack[key][keep]
+    return picked
+
+
+def _ratio(num, den):
+    return np.divide(num, den, out=np.zeros(np.shape(num), dtype=np.float64), where=den > 0)
+
+
+def heatmap(stack):
+    teaching = np.isin(stack["kind"], TEACHING).sum(axis=0)
+    open_cells = ((stack["kind"] != ABSENT) & (stack["kind"] != BREAK)).sum(axis=0)
+    share = _ratio(teaching, open_cells)
+    return [dict({"slot": slot}, **{day: round(float(share[d, t]), 3) for d, day in enumerate(DAYS)})
+            for t, slot in enumerate(stack["slots"])]
+
+
+def _daily_hours(stack):
+    teaching = np.isin(stack["kind"], TEACHING)
+    return (teaching * stack["slot_hours"]).sum(axis=2)  # section x day
+
+
+def days(stack):
+    hours = _daily_hours(stack)
+    if not len(hours):
+        return []
+    return [{"day": day, "mean_hours": round(float(hours[:, d].mean()), 2),
+             "min_hours": round(float(hours[:, d].min()), 2),
+             "max_hours": round(float(hours[:, d].max()), 2)}
+            for d, day in enumerate(DAYS)]
+
+
+def section_load(stack):
+    hours = _daily_hours(stack)
+    return [dict({"section": name, "term": term},
+                 **{day: round(float(hours[s, d]), 2) for d, day in enumerate(DAYS)},
+                 total=round(float(hours[s].sum()), 2))
+            for s, (name, term) in enumerate(zip(stack["sections"], stack["terms"]))]
+
+
+def _term_index(stack):
+    """
+    (term names, term index of each section). Sessions of different terms
+    never run at the same time, so concurrency is counted per term.
+    """
+    names, index = np.unique(stack["terms"].astype(str), return_inverse=True)
+    return names.tolist(), index.reshape(-1)
+
+
+def labs(stack):
+    terms, term_of = _term_index(stack)
+    s, d, t = np.nonzero(stack["kind"] == LAB)
+    running = np.zeros((len(terms), len(DAYS), len(stack["slots"])), dtype=np.int32)
+    np.add.at(running, (term_of[s], d, t), 1)
+    return [dict({"term": term, "slot": slot}, **{day: int(running[k, d, t]) for d, day in enumerate(DAYS)},
+                 peak=int(running[k, :, t].max()))
+            for k, term in enumerate(terms) for t, slot in enumerate(stack["slots"]) if running[k, :, t].any()]
+
+
+def rooms(stack):
+    terms, term_of = _term_index(stack)
+    n_rooms = len(stack["rooms"])
+    s, d, t = np.nonzero(stack["room"] >= 0)
+    busy = np.zeros((len(terms), n_rooms, len(DAYS), len(stack["slots"])), dtype=np.int32)
+    np.add.at(busy, (term_of[s], stack["room"][s, d, t], d, t), 1)
+
+    # Cells a room could be used in: the slots that hold a lecture or tutorial in that term
+    teaching = np.zeros((len(terms), len(stack["slots"])), dtype=bool)
+    np.logical_or.at(teaching, term_of, np.isin(stack["kind"], [LECTURE, TUTORIAL]).any(axis=1))
+    open_cells = teaching.sum(axis=1) * len(DAYS)
+
+    used = (busy > 0).sum(axis=(2, 3))        # term x room
+    clashes = (busy > 1).sum(axis=(2, 3))
+    utilization = _ratio(used, np.broadcast_to(open_cells[:, None], used.shape))
+    return [{"term": term, "room": name, "busy_cells": int(used[k, r]),
+             "utilization": round(float(utilization[k, r]), 3), "clashes": int(clashes[k, r])}
+            for k, term in enumerate(terms) for r, name in enumerate(stack["rooms"]) if used[k, r]]
+
+
+def courses(stack):
+    n_courses = len(stack["courses"])
+    s, d, t = np.nonzero(stack["course"] >= 0)
+    counts = np.zeros((n_courses, len(stack["sections"]), len(DAYS)), dtype=np.int32)
+    np.add.at(counts, (stack["course"][s, d, t], s, d), 1)
+
+    runs = counts.sum(axis=2) > 0               # course x section
+    days_used = (counts > 0).sum(axis=2)        # course x section
+    n_sections = runs.sum(axis=1)
+    mean_days = _ratio(days_used.sum(axis=1), n_sections)
+    min_days = np.where(runs, days_used, len(DAYS)).min(axis=1, initial=len(DAYS))
+    sessions = counts.sum(axis=(1, 2))
+    most_in_day = counts.max(axis=(1, 2), initial=0)
+    return [{"course": code, "sections": int(n_sections[c]), "sessions": int(sessions[c]),
+             "mean_days": round(float(mean_days[c]), 2), "min_days": int(min_days[c]),
+             "max_per_day": int(most_in_day[c])}
+            for c, code in enumerate(stack["courses"]) if n_sections[c]]
+
+
+VIEWS = {
+    "heatmap": heatmap,
+    "days": days,
+    "section_load": section_load,
+    "labs": labs,
+    "rooms": rooms,
+    "courses": courses,
+}
+
+
+def summary(stack):
+    """
+    Every view of `stack`, plus what it covers, as one JSON-ready dict.
+    """
+    result = {
+        "sections": len(stack["sections"]),
+        "terms": sorted(set(stack["terms"].tolist())),
+        "slots": stack["slots"],
+    }
+    for name, view in VIEWS.items():
+        result[name] = view(stack)
+    return result
+
+
+def write_csv(rows, fh):
+    writer = csv.DictWriter(fh, fieldnames=list(rows[0]) if rows else [])
+    writer.writeheader()
+    writer.writerows(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Utilization analytics over stored timetables")
+    parser.add_argument("--root", default=TIMETABLE_DIR)
+    parser.add_argument("--term", default=None, help="only this term (default: all)")
+    parser.add_argument("--view", choices=sorted(VIEWS), help="one view only (default: all, as JSON)")
+    parser.add_argument("--csv", help="write the view as CSV to this file ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    stack = select(load(args.root), args.term)
+    if args.view is None:
+        json.dump(summary(stack), sys.stdout, indent=1)
+        print()
+        return
+
+    rows = VIEWS[args.view](stack)
+    if args.csv == "-":
+        write_csv(rows, sys.stdout)
+    elif args.csv:
+        with open(args.csv, "w", newline="") as fh:
+            write_csv(rows, fh)
+    else:
+        json.dump(rows, sys.stdout, indent=1)
+        print()
+
+
+if __name__ == '__main__':
+    main()
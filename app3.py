@@ -1,8 +1,17 @@
-from flask import Flask, render_template, request, redirect, url_for
+from flask import Flask, render_template, request, redirect, url_for, jsonify, Response
+from werkzeug.utils import secure_filename
+import io
+import json
 import os
-import random
-from openpyxl import load_workbook
-import pandas as pd
+import socket
+
+import analytics
+import catalog_cache
+import electives
+import instructors
+import page_cache
+import scheduler
+import sweep
 
 app = Flask(__name__)
 app.config['UPLOAD_FOLDER'] = 'uploads'
@@ -11,202 +20,31 @@ if not os.path.exists(app.config['UPLOAD_FOLDER']):
     os.makedirs(app.config['UPLOAD_FOLDER'])
 
 timetable_context = {}
+timetable_version = 0  # bumped on every upload; keys the rendered-page cache
 
-def parse_credits(credit_str):
+def client_disconnected():
     """
-    Parse a credit string of the form "L-T-P-S-C" and return (L, T, P, S, C).
-    If parsing fails, return zeros.
+    True if the client of the current request has closed its connection.
+    Peeks at the request socket without blocking (dev server and gunicorn);
+    under other servers it always says False. The socket is switched to
+    non-blocking for the peek (MSG_DONTWAIT does not exist on Windows).
     """
+    sock = request.environ.get('werkzeug.socket') or request.environ.get('gunicorn.socket')
+    if sock is None:
+        return False
+    timeout = sock.gettimeout()
     try:
-        L_str, T_str, P_str, S_str, C_str = credit_str.split('-')
-        return int(L_str), int(T_str), int(P_str), int(S_str), int(C_str)
-    except:
-        return 0, 0, 0, 0, 0
-
-def parse_time_24h(time_str):
-    """
-    Parse a single 24-hour time string like '09:00' or '17:30' -> float (9.0, 17.5, etc.)
-    If invalid, return 0.0
-    """
-    time_str = time_str.strip()  # e.g. "09:00"
-    if ':' not in time_str:
-        return 0.0
-    hhmm = time_str.split(':')
-    if len(hhmm) != 2:
-        return 0.0
-    hh = int(hhmm[0])
-    mm = int(hhmm[1])
-    return hh + mm/60.0
-
-def parse_time_range_24h(slot_str):
-    """
-    Parse a slot like '09:00 - 10:30' (24h format).
-    We'll extract the start time substring and parse it with parse_time_24h.
-    If we can't parse, return 0.0
-    """
-    slot_str = slot_str.strip()  # e.g. "09:00 - 10:30"
-    parts = slot_str.split('-')
-    if len(parts) != 2:
-        return 0.0
-    start_part = parts[0].strip()  # "09:00"
-    return parse_time_24h(start_part)
-
-def schedule_courses(courses, color_map,
-                     lecture_slots, tutorial_slots, lab_slots, minor_slots,
-                     morning_break, lunch_break):
-    """
-    1) Combine all user-provided slots (minor, lecture, morning_break, tutorial, lunch_break, lab).
-    2) Sort them by start time (24-hour) so they appear in chronological order.
-    3) Keep minor slots empty (not used for scheduling).
-    4) Place HS205 only if there's a "17:00 - 18:30" slot, randomly in one of the 5 days.
-    5) Randomly schedule L, T, P in the user-defined lecture, tutorial, lab slots.
-    """
-    days = ["MON", "TUE", "WED", "THU", "FRI"]
-    # We'll treat "17:00 - 18:30" as the special HS205 slot if user includes it.
-    hs205_slot = "17:00 - 18:30"
-
-    # Combine all user slots in the order: minor -> lecture -> morning break -> tutorial -> lunch break -> lab
-    combined_slots = []
-    combined_slots.extend(minor_slots)     # minor
-    combined_slots.extend(lecture_slots)   # lecture
-    combined_slots.append(morning_break)   # morning break
-    combined_slots.extend(tutorial_slots)  # tutorial
-    combined_slots.append(lunch_break)     # lunch break
-    combined_slots.extend(lab_slots)       # labs
-
-    # If we want to ensure the HS205 slot is recognized if not already present, we can forcibly add it:
-    if hs205_slot not in combined_slots:
-        combined_slots.append(hs205_slot)
-
-    # Sort by start time in 24h format
-    combined_slots = sorted(combined_slots, key=lambda s: parse_time_range_24h(s))
-
-    # Initialize timetable
-    timetable = {}
-    for d in days:
-        timetable[d] = {}
-        for slot in combined_slots:
-            if slot == morning_break:
-                timetable[d][slot] = "Morning Break"
-            elif slot == lunch_break:
-                timetable[d][slot] = "Lunch Break"
-            else:
-                timetable[d][slot] = ""
-
-    def course_in_day(course_label, day):
-        for val in timetable[day].values():
-            if val == course_label:
-                return True
+        sock.settimeout(0)
+        return sock.recv(1, socket.MSG_PEEK) == b''
+    except BlockingIOError:
         return False
-
-    MAX_ATTEMPTS = 50
-
-    # 1) Place HS205 in "17:00 - 18:30" if it exists
-    for c in courses:
-        code = str(c.get("Course Code", "")).strip().upper()
-        if code == "HS205":
-            if hs205_slot in combined_slots:
-                # randomly place among MON-FRI
-                attempts = 0
-                placed = False
-                while not placed and attempts < MAX_ATTEMPTS:
-                    attempts += 1
-                    random.shuffle(days)
-                    for d in days:
-                        if timetable[d][hs205_slot] == "":
-                            timetable[d][hs205_slot] = "HS205"
-                            placed = True
-                            break
-            break  # done with HS205
-
-    # 2) Schedule labs
-    for c in courses:
-        code = str(c.get("Course Code", "")).strip()
-        if code.upper() == "HS205":
-            continue
-        L, T, P, S, C = parse_credits(c.get("Credits (L-T-P-S-C)", "0-0-0-0-0"))
-        if P > 0:
-            labs_needed = P // 2 if P >= 2 else P
-            attempts = 0
-            while labs_needed > 0 and attempts < MAX_ATTEMPTS:
-                attempts += 1
-                random.shuffle(days)
-                random.shuffle(lab_slots)
-                placed = False
-                for d in days:
-                    if course_in_day(code, d) or course_in_day(code + "_LAB", d):
-                        continue
-                    for lab in lab_slots:
-                        if lab in timetable[d] and timetable[d][lab] == "":
-                            timetable[d][lab] = code + "_LAB(2hrs)"
-                            labs_needed -= 1
-                            placed = True
-                            break
-                    if placed:
-                        break
-
-    # 3) Schedule lectures (L) in lecture_slots only
-    for c in courses:
-        code = str(c.get("Course Code", "")).strip()
-        if code.upper() == "HS205":
-            continue
-        L, _, _, _, _ = parse_credits(c.get("Credits (L-T-P-S-C)", "0-0-0-0-0"))
-        lectures_needed = L-1
-        attempts = 0
-        while lectures_needed > 0 and attempts < MAX_ATTEMPTS:
-            attempts += 1
-            random.shuffle(days)
-            random.shuffle(lecture_slots)
-            placed = False
-            for d in days:
-                if course_in_day(code, d) or course_in_day(code + "_LAB", d):
-                    continue
-                for ls in lecture_slots:
-                    if ls in timetable[d] and timetable[d][ls] == "":
-                        timetable[d][ls] = code
-                        lectures_needed -= 1
-                        placed = True
-                        break
-                if placed:
-                    break
-            if not placed:
-                break
-
-    # 4) Schedule tutorials (T) in tutorial_slots only
-    for c in courses:
-        code = str(c.get("Course Code", "")).strip()
-        if code.upper() == "HS205":
-            continue
-        _, T, _, _, _ = parse_credits(c.get("Credits (L-T-P-S-C)", "0-0-0-0-0"))
-        tutorials_needed = T
-        attempts = 0
-        while tutorials_needed > 0 and attempts < MAX_ATTEMPTS:
-            attempts += 1
-            random.shuffle(days)
-            random.shuffle(tutorial_slots)
-            placed = False
-            for d in days:
-                if course_in_day(code + "_TUT", d):
-                    continue
-                for ts in tutorial_slots:
-                    if ts in timetable[d] and timetable[d][ts] == "":
-                        timetable[d][ts] = code + "_TUT"
-                        tutorials_needed -= 1
-                        placed = True
-                        break
-                if placed:
-                    break
-            if not placed:
-                break
-
-    # Minor slots remain empty (not used for scheduling)
-    # Make sure each course has a color
-    for c in courses:
-        c_code = str(c.get("Course Code", "")).strip()
-        if c_code not in color_map or not color_map[c_code]:
-            color_map[c_code] = "#FFD700"
-
-    return timetable
+    except OSError:
+        return True
+    finally:
+        try:
+            sock.settimeout(timeout)
+        except OSError:
+            pass
 
 @app.route('/')
 def index():
@@ -219,6 +57,9 @@ def upload_file():
     uploaded_file = request.files['excel_file']
     if uploaded_file.filename == '':
         return "No file selected", 400
+    engine = request.form.get('engine', 'auto')
+    if engine != 'auto' and engine not in scheduler.ENGINES:
+        return f"Unknown engine: {engine}", 400
 
     filepath = os.path.join(app.config['UPLOAD_FOLDER'], uploaded_file.filename)
     uploaded_file.save(filepath)
@@ -256,47 +97,57 @@ def upload_file():
     morning_break = request.form.get('morning_break', '10:30 - 11:00').strip()
     lunch_break = request.form.get('lunch_break', '13:30 - 14:30').strip()
 
-    # 3) Extract color codes from Excel
-    wb = load_workbook(filepath, data_only=True)
-    sheet = wb.active
-
-    headers = {}
-    for cell in sheet[1]:
-        if cell.value:
-            headers[cell.value] = cell.column_letter
-    course_code_col = headers.get("Course Code", "B")
-
-    color_map = {}
-    for row_idx in range(2, sheet.max_row + 1):
-        code_cell = sheet[f"{course_code_col}{row_idx}"]
-        if code_cell.value is None:
-            continue
-        code_value = str(code_cell.value).strip()
-        if not code_value:
-            continue
-        fill_color = code_cell.fill.fgColor
-        if fill_color and hasattr(fill_color, 'rgb') and fill_color.rgb:
-            fill_rgb = str(fill_color.rgb)
-            if len(fill_rgb) == 8:
-                color_map[code_value] = f"#{fill_rgb[2:]}"
-            else:
-                color_map[code_value] = f"#{fill_rgb}"
-        else:
-            color_map[code_value] = ""
-
-    # 4) Read courses with pandas
-    df = pd.read_excel(filepath)
-    courses = df.to_dict('records')
-
-    # 5) Generate timetable
-    timetable = schedule_courses(
-        courses, color_map,
-        lecture_slots, tutorial_slots, lab_slots, minor_slots,
-        morning_break, lunch_break
+    # 3) Read courses and their color codes (parsed once per workbook, see catalog_cache.py)
+    courses, color_map = catalog_cache.load_catalog(filepath)
+
+    # 4) Optional student enrolments for electives in the minor slots
+    enrolments = None
+    enrolment_file = request.files.get('enrolment_file')
+    if enrolment_file is not None and enrolment_file.filename != '':
+        # Own prefix, so it can never overwrite the course workbook of the same request
+        enrolment_name = "enrolments_" + (secure_filename(enrolment_file.filename) or "upload.csv")
+        enrolment_path = os.path.join(app.config['UPLOAD_FOLDER'], enrolment_name)
+        enrolment_file.save(enrolment_path)
+        try:
+            enrolments = electives.read_enrolments(enrolment_path)
+        except ValueError as e:
+            return f"Invalid enrolment sheet: {e}", 400
+
+    # 5) Instructor availability ("Availability" sheet, cached with the catalog) and workload limits
+    max_hours_per_day = request.form.get('max_hours_per_day', type=float)
+    max_consecutive = request.form.get('max_consecutive', type=int)
+    try:
+        instructor_index = instructors.InstructorIndex(
+            catalog_cache.load_availability(filepath), max_hours_per_day, max_consecutive
+        )
+    except ValueError as e:
+        return f"Invalid Availability sheet: {e}", 400
+
+    # 6) Generate timetable; HS205 goes in "17:00 - 18:30" on one random day.
+    #    With a time budget the best timetable found within it is shown, and the
+    #    run stops early if the browser goes away.
+    slots = {
+        "lecture": lecture_slots,
+        "tutorial": tutorial_slots,
+        "lab": lab_slots,
+        "minor": minor_slots,
+        "morning_break": morning_break,
+        "lunch_break": lunch_break,
+        "hs205_slot": "17:00 - 18:30",
+        "hs205_days": None,
+    }
+    timetable, report = scheduler.schedule_courses(
+        courses, color_map, slots, enrolments,
+        engine=engine,
+        instructors=instructor_index,
+        deadline_ms=request.form.get('deadline_ms', type=float),
+        cancel=client_disconnected
     )
+    if report["cancelled"]:
+        return "Client closed request", 499
 
-    # 6) Build context
-    global timetable_context
+    # 7) Build context
+    global timetable_context, timetable_version
     timetable_context = {
         "institute_name": "Indian Institute of Information Technology Dharwad",
         "academic_year": request.form.get('academic_year', 'Jan - April 2025'),
@@ -306,13 +157,90 @@ def upload_file():
         "group_mail": request.form.get('group_mail', '2023csea@iiitdwd.ac.in'),
         "color_map": color_map,
         "timetable": timetable,
-        "courses": courses
+        "courses": courses,
+        "report": report,
+        "unplaced_electives": report["unplaced_electives"]
     }
+    timetable_version += 1
+    page_cache.invalidate(keep=timetable_version)
+
+    # 8) Keep it for the analytics across sections and terms
+    analytics.save_timetable(
+        f"{timetable_context['branch']}-{timetable_context['semester']}-{timetable_context['classroom']}",
+        timetable_context['academic_year'], timetable, color_map, report,
+        room=timetable_context['classroom']
+    )
     return redirect(url_for('show_timetable'))
 
 @app.route('/timetable')
 def show_timetable():
-    return render_template('timetable.html', **timetable_context)
+    return page_cache.cached_response(
+        timetable_version,
+        lambda: render_template('timetable.html', **timetable_context)
+    )
+
+@app.route('/sweep', methods=['POST'])
+def sweep_layouts():
+    """
+    Compare slot layouts for one course sheet: form fields `excel_file`,
+    `grid` (JSON, see sweep.py), optional `repeats`, `deadline_ms` (per run)
+    and `format=csv`.
+    """
+    if 'excel_file' not in request.files or request.files['excel_file'].filename == '':
+        return "No file selected", 400
+    engine = request.form.get('engine', 'auto')
+    if engine != 'auto' and engine not in scheduler.ENGINES:
+        return f"Unknown engine: {engine}", 400
+    try:
+        configs = sweep.expand_grid(json.loads(request.form.get('grid', '{}')))
+    except ValueError as e:
+        return f"Invalid grid: {e}", 400
+    repeats = request.form.get('repeats', 3, type=int)
+    if not 1 <= repeats <= sweep.MAX_REPEATS:
+        return f"repeats must be between 1 and {sweep.MAX_REPEATS}", 400
+
+    uploaded_file = request.files['excel_file']
+    filepath = os.path.join(app.config['UPLOAD_FOLDER'], uploaded_file.filename)
+    uploaded_file.save(filepath)
+
+    courses, _ = catalog_cache.load_catalog(filepath)
+    rows = sweep.run_sweep(
+        courses, configs,
+        repeats=repeats,
+        engine=engine,
+        deadline_ms=request.form.get('deadline_ms', type=float)
+    )
+
+    if request.form.get('format') == 'csv':
+        out = io.StringIO()
+        sweep.write_csv(rows, out)
+        return Response(out.getvalue(), mimetype='text/csv')
+    return jsonify(rows)
+
+@app.route('/analytics')
+def show_analytics():
+    """
+    Utilization analytics over every stored timetable (see analytics.py).
+    Query: optional `term`, `view` (one of analytics.VIEWS) and `format=csv`
+    (needs a view).
+    """
+    view = request.args.get('view')
+    as_csv = request.args.get('format') == 'csv'
+    valid = ', '.join(sorted(analytics.VIEWS))
+    if view is None and as_csv:
+        return f"format=csv needs a view, one of: {valid}", 400
+    if view is not None and view not in analytics.VIEWS:
+        return f"Unknown view: {view} (valid views: {valid})", 400
+
+    stack = analytics.select(analytics.load(), request.args.get('term'))
+    if view is None:
+        return jsonify(analytics.summary(stack))
+    rows = analytics.VIEWS[view](stack)
+    if as_csv:
+        out = io.StringIO()
+        analytics.write_csv(rows, out)
+        return Response(out.getvalue(), mimetype='text/csv')
+    return jsonify(rows)
 
 if __name__ == '__main__':
     app.run(debug=True)
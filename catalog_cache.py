@@ -0,0 +1,258 @@
+"""
+On-disk cache of parsed course catalogs.
+
+Parsing the .xlsx (openpyxl for the colours, pandas for the rows) dominates
+an upload, and the same master catalogs are uploaded again and again. The
+first time a workbook is seen, its sheet is written as one .npy file per
+column under CACHE_DIR/<sha256 of the workbook>/:
+
+    meta.json          column names and kinds, row count, source file name
+    color_codes.npy    course codes of the colour map read from the sheet
+    color_values.npy   their colours
+    col_<i>.npy        every original column (plus col_<i>_null.npy for text)
+    availability.json  the "Availability" sheet (see instructors.py), written
+                       the first time load_availability() asks for it
+
+Later requests, in this or any other worker process, memory-map these
+files instead of parsing the workbook, and load_catalog() turns the
+columns back into the row dicts the scheduler takes. That is one pass over
+a few dozen rows, not a zero-copy load; the saving is the workbook parse.
+Entries are keyed by the workbook's hash, so a changed workbook gets a new
+entry and the stale one for the same path is removed. Arrays already mapped
+from a removed entry stay readable until they are dropped.
+"""
+import hashlib
+import json
+import os
+import shutil
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+import instructors
+
+CACHE_DIR = os.path.join("uploads", "catalog_cache")
+
+MAX_HASHES = 256  # files whose hash is remembered
+
+_hashes = OrderedDict()  # (path, size, mtime) -> sha256, so one upload is hashed once
+
+
+def file_hash(filepath):
+    st = os.stat(filepath)
+    key = (os.path.abspath(filepath), st.st_size, st.st_mtime_ns)
+    if key in _hashes:
+        _hashes.move_to_end(key)
+        return _hashes[key]
+    sha = _hashes[key] = _sha256(filepath)
+    if len(_hashes) > MAX_HASHES:
+        _hashes.popitem(last=False)
+    return sha
+
+
+def _sha256(filepath):
+    sha = hashlib.sha256()
+    with open(filepath, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def _sheet_color_map(sheet):
+    headers = {}
+    for cell in sheet[1]:
+        if cell.value:
+            headers[cell.value] = cell.column_letter
+    course_code_col = headers.get("Course Code", "B")
+
+    color_map = {}
+    for row_idx in range(2, sheet.max_row + 1):
+        code_cell = sheet[f"{course_code_col}{row_idx}"]
+        if code_cell.value is None:
+            continue
+        code_value = str(code_cell.value).strip()
+        if not code_value:
+            continue
+        fill_color = code_cell.fill.fgColor
+        if fill_color and hasattr(fill_color, 'rgb') and fill_color.rgb:
+            fill_rgb = str(fill_color.rgb)
+            if len(fill_rgb) == 8:
+                color_map[code_value] = f"#{fill_rgb[2:]}"
+            else:
+                color_map[code_value] = f"#{fill_rgb}"
+        else:
+            color_map[code_value] = ""
+    return color_map
+
+
+def read_color_map(filepath):
+    """
+    Extract the fill colour of each "Course Code" cell of the active sheet with openpyxl.
+    Returns {code: "#RRGGBB"}, or "" for cells without a fill.
+    """
+    wb = load_workbook(filepath, data_only=True)
+    return _sheet_color_map(wb.active)
+
+
+def read_color_maps(filepath):
+    """
+    Like read_color_map(), for every sheet at once: {sheet name: color_map}.
+    """
+    wb = load_workbook(filepath, data_only=True)
+    return {sheet.title: _sheet_color_map(sheet) for sheet in wb.worksheets}
+
+
+def _str_array(values):
+    # Fixed-width unicode so the file can be memory-mapped; at least 1 char wide
+    values = list(values)
+    width = max([len(v) for v in values] + [1])
+    return np.array(values, dtype=f"<U{width}")
+
+
+def _write_entry(entry_dir, filepath, sha):
+    """
+    Parse the workbook and write its columns into `entry_dir`.
+    The files go to a temporary directory first and are renamed into place,
+    so readers never see a half-written entry.
+    """
+    color_map = read_color_map(filepath)
+    df = pd.read_excel(filepath)
+
+    tmp_dir = f"{entry_dir}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    columns = []
+    for i, name in enumerate(df.columns):
+        series = df[name]
+        col = {"name": str(name), "file": f"col_{i}.npy"}
+        if pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype):
+            col["kind"] = "num"
+            np.save(os.path.join(tmp_dir, col["file"]), series.to_numpy())
+        else:
+            col["kind"] = "str"
+            nulls = series.isna().to_numpy()
+            np.save(os.path.join(tmp_dir, col["file"]), _str_array("" if n else str(v) for v, n in zip(series, nulls)))
+            np.save(os.path.join(tmp_dir, f"col_{i}_null.npy"), nulls)
+        columns.append(col)
+
+    np.save(os.path.join(tmp_dir, "color_codes.npy"), _str_array(color_map.keys()))
+    np.save(os.path.join(tmp_dir, "color_values.npy"), _str_array(color_map.values()))
+
+    meta = {
+        "source": os.path.basename(filepath),
+        "path": os.path.abspath(filepath),
+        "sha256": sha,
+        "rows": len(df),
+        "columns": columns,
+    }
+    with open(os.path.join(tmp_dir, "meta.json"), "w") as fh:
+        json.dump(meta, fh)
+
+    try:
+        os.rename(tmp_dir, entry_dir)
+    except OSError:
+        # Another worker finished the same entry first; theirs is identical
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def _drop_stale(cache_dir, path, keep):
+    """
+    Remove older entries built from the file at `path`. Each one is renamed
+    away before it is deleted, so a reader sees a whole entry or none.
+    """
+    for name in os.listdir(cache_dir):
+        if name == keep or ".tmp-" in name or ".old-" in name:
+            continue
+        try:
+            with open(os.path.join(cache_dir, name, "meta.json")) as fh:
+                if json.load(fh).get("path") != path:
+                    continue
+            old_dir = os.path.join(cache_dir, f"{name}.old-{os.getpid()}")
+            os.rename(os.path.join(cache_dir, name), old_dir)
+        except (OSError, ValueError):
+            continue
+        shutil.rmtree(old_dir, ignore_errors=True)
+
+
+def _entry(filepath, cache_dir):
+    """
+    The cache entry directory of `filepath`, written first on a miss.
+    """
+    sha = file_hash(filepath)
+    entry_dir = os.path.join(cache_dir, sha)
+    if not os.path.exists(os.path.join(entry_dir, "meta.json")):
+        os.makedirs(cache_dir, exist_ok=True)
+        _write_entry(entry_dir, filepath, sha)
+        _drop_stale(cache_dir, os.path.abspath(filepath), keep=sha)
+    return entry_dir
+
+
+def load_columns(filepath, cache_dir=CACHE_DIR):
+    """
+    Return the cached catalog for `filepath` as a dict of memory-mapped arrays
+    ("color_codes", "color_values", "col_<i>", "col_<i>_null") plus "meta". The workbook is parsed only on a cache miss.
+    """
+    try:
+        return _map_entry(_entry(filepath, cache_dir))
+    except FileNotFoundError:
+        # Another worker dropped the entry between the lookup and the reads
+        return _map_entry(_entry(filepath, cache_dir))
+
+
+def _map_entry(entry_dir):
+    with open(os.path.join(entry_dir, "meta.json")) as fh:
+        meta = json.load(fh)
+    columns = {"meta": meta}
+    for fname in os.listdir(entry_dir):
+        if fname.endswith(".npy"):
+            path = os.path.join(entry_dir, fname)
+            try:
+                columns[fname[:-4]] = np.load(path, mmap_mode="r")
+            except ValueError:
+                columns[fname[:-4]] = np.load(path)  # empty arrays cannot be mapped
+    return columns
+
+
+def load_catalog(filepath, cache_dir=CACHE_DIR):
+    """
+    Drop-in replacement for reading the workbook in upload_file().
+    Returns (courses, color_map) with the same values pandas / openpyxl would give.
+    """
+    columns = load_columns(filepath, cache_dir)
+    meta = columns["meta"]
+
+    values = []
+    for i, col in enumerate(meta["columns"]):
+        data = columns[f"col_{i}"].tolist()
+        if col["kind"] == "str":
+            nulls = columns[f"col_{i}_null"]
+            data = [float("nan") if null else v for v, null in zip(data, nulls)]
+        values.append(data)
+
+    names = [col["name"] for col in meta["columns"]]
+    courses = [dict(zip(names, row)) for row in zip(*values)] if values else []
+    color_map = dict(zip(columns["color_codes"].tolist(), columns["color_values"].tolist()))
+    return courses, color_map
+
+
+def load_availability(filepath, cache_dir=CACHE_DIR):
+    """
+    instructors.read_availability() for `filepath`, kept in the workbook's
+    cache entry so the workbook is not opened again on later uploads.
+    """
+    path = os.path.join(_entry(filepath, cache_dir), "availability.json")
+    try:
+        with open(path) as fh:
+            return {name: [tuple(w) for w in windows] for name, windows in json.load(fh).items()}
+    except FileNotFoundError:
+        pass
+
+    availability = instructors.read_availability(filepath)
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with open(tmp_path, "w") as fh:
+        json.dump(availability, fh)
+    os.replace(tmp_path, path)
+    return availability
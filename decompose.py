@@ -0,0 +1,210 @@
+"""
+Department-wide scheduling by independent components.
+
+A department workbook has one sheet per section (plus an optional
+"Availability" sheet, see instructors.py). Two sections depend on each other
+only when they share an instructor or a classroom, so the sections are
+grouped into the connected components of that resource-sharing graph.
+Components share nothing, so each one is scheduled on its own worker
+process, and the wall time follows the largest component rather than the
+whole catalog. Inside a component the sections are scheduled one after the
+other with a shared index of instructor and room bookings.
+
+    python decompose.py department.xlsx --term "Jan - April 2025"
+
+Each section's timetable is stored with analytics.save_timetable().
+"""
+import argparse
+import json
+import numbers
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import analytics
+import catalog_cache
+import instructors
+import scheduler
+
+ROOM_COLUMNS = ["Room No.", "Classroom"]
+
+
+def course_room(course):
+    """
+    The course's classroom as text, or None. pandas reads a column of room
+    numbers as floats, so 104.0 (or numpy.int64(104)) comes back as "104".
+    """
+    for col in ROOM_COLUMNS:
+        value = course.get(col)
+        if value is None or isinstance(value, (bool, np.bool_)) or not pd.notna(value):
+            continue
+        if isinstance(value, numbers.Real) and float(value).is_integer():
+            value = int(value)
+        value = str(value).strip()
+        if value:
+            return value
+    return None
+
+
+class ResourceIndex(instructors.InstructorIndex):
+    """
+    Instructor index that also books the classroom of each lecture and tutorial.
+    Rooms are only checked for clashes, never for workload limits.
+    """
+
+    def teachers_of(self, course):
+        teachers = super().teachers_of(course)
+        room = course_room(course)
+        if room:
+            name = "room:" + room
+            self.exempt.add(name)
+            teachers["lecture"].append(name)
+            teachers["tutorial"].append(name)
+        return teachers
+
+
+def read_department(filepath, availability_sheet="Availability"):
+    """
+    Read every section sheet. Returns {section: (courses, color_map)}.
+    """
+    sheets = pd.read_excel(filepath, sheet_name=None)
+    color_maps = catalog_cache.read_color_maps(filepath)
+    sections = {}
+    for name, df in sheets.items():
+        if name == availability_sheet:
+            continue
+        sections[name] = (df.to_dict('records'), color_maps.get(name, {}))
+    return sections
+
+
+def section_resources(courses):
+    """
+    The instructors and rooms a section's courses use. HS205 is one combined
+    class for every section, so it does not tie sections together.
+    """
+    resources = set()
+    for c in courses:
+        if scheduler.course_code(c).upper() == "HS205":
+            continue
+        for names in instructors.course_instructors(c).values():
+            resources.update("instructor:" + n for n in names)
+        room = course_room(c)
+        if room:
+            resources.add("room:" + room)
+    return resources
+
+
+def find_components(sections):
+    """
+    Group section names into connected components of the resource-sharing graph.
+    `sections` maps section -> courses. Returns a list of lists, largest first.
+    """
+    parent = {name: name for name in sections}
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    owner = {}  # resource -> first section seen using it
+    for name, courses in sections.items():
+        for resource in section_resources(courses):
+            if resource in owner:
+                parent[find(name)] = find(owner[resource])
+            else:
+                owner[resource] = name
+
+    groups = {}
+    for name in sections:
+        groups.setdefault(find(name), []).append(name)
+    return sorted(groups.values(), key=lambda g: -sum(len(sections[n]) for n in g))
+
+
+def schedule_component(sections, slots, engine, seed, availability, max_hours_per_day, max_consecutive):
+    """
+    Schedule the sections of one component in turn, sharing one ResourceIndex.
+    `sections` maps section -> (courses, color_map). Runs in a worker process.
+    Returns {section: (timetable, color_map, report)}.
+    """
+    index = ResourceIndex(availability, max_hours_per_day, max_consecutive)
+    results = {}
+    for i, (name, (courses, color_map)) in enumerate(sorted(sections.items())):
+        timetable, report = scheduler.schedule_courses(
+            courses, color_map, slots, engine=engine, seed=seed + i, instructors=index
+        )
+        results[name] = (timetable, color_map, report)
+    return results
+
+
+def schedule_department(sections, slots, engine="auto", seed=0, availability=None,
+                        max_hours_per_day=None, max_consecutive=None, workers=None):
+    """
+    Schedule all sections ({section: (courses, color_map)}) component by component
+    on a process pool and merge the results into {section: (timetable, color_map, report)}.
+    """
+    slots = dict(slots)
+    if not slots.get("hs205_days"):
+        # HS205 is a combined class, so every section gets it on the same day
+        slots["hs205_days"] = [random.Random(seed).choice(scheduler.DAYS)]
+
+    components = find_components({name: courses for name, (courses, _) in sections.items()})
+    jobs = [({name: sections[name] for name in group}, slots, engine, seed + 1000 * i,
+             availability, max_hours_per_day, max_consecutive)
+            for i, group in enumerate(components)]
+
+    merged = {}
+    if len(jobs) <= 1 or workers == 1:
+        for job in jobs:
+            merged.update(schedule_component(*job))
+        return merged
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(schedule_component, *job) for job in jobs]
+        for future in futures:
+            merged.update(future.result())
+    return merged
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Schedule every section of a department workbook")
+    parser.add_argument("workbook", help="one sheet per section, optional 'Availability' sheet")
+    parser.add_argument("--out-dir", default=analytics.TIMETABLE_DIR)
+    parser.add_argument("--slots", help="JSON file with a slots dict (default: index.html's defaults)")
+    parser.add_argument("--term", default="", help="e.g. 'Jan - April 2025 / IV', stored with each timetable")
+    parser.add_argument("--engine", default="auto", choices=["auto"] + sorted(scheduler.ENGINES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--max-hours-per-day", type=float, default=None)
+    parser.add_argument("--max-consecutive", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    slots = scheduler.DEFAULT_SLOTS
+    if args.slots:
+        with open(args.slots) as fh:
+            slots = json.load(fh)
+
+    sections = read_department(args.workbook)
+    components = find_components({name: courses for name, (courses, _) in sections.items()})
+    print(f"{len(sections)} sections in {len(components)} independent components "
+          f"(largest: {max(len(g) for g in components) if components else 0} sections)")
+
+    start = time.perf_counter()
+    results = schedule_department(
+        sections, slots, args.engine, args.seed, catalog_cache.load_availability(args.workbook),
+        args.max_hours_per_day, args.max_consecutive, args.workers
+    )
+    print(f"scheduled in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    for name, (timetable, color_map, report) in sorted(results.items()):
+        print(f"  {name}: {report['placed']}/{report['required']} sessions ({report['engine']})")
+        rooms = {scheduler.course_code(c): course_room(c) for c in sections[name][0] if course_room(c)}
+        analytics.save_timetable(name, args.term, timetable, color_map, report, rooms=rooms,
+                                 root=args.out_dir)
+
+
+if __name__ == '__main__':
+    main()
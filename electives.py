@@ -0,0 +1,152 @@
+"""
+Elective / minor-slot scheduling.
+
+Electives are placed in the minor slots so that no student has two of their
+chosen courses at the same time. Student enrolments are turned into a course
+conflict graph (two courses are adjacent when at least one student takes
+both), and the graph is coloured with the DSATUR heuristic. Each colour is
+one minor-slot band: all electives of a colour share no students, so they
+run in parallel in that band. An elective meets in its band on as many days
+as its credits need (see scheduler.elective_sessions), spread over the week;
+electives that are not in the course sheet meet every day.
+"""
+import heapq
+
+import pandas as pd
+
+ENROLMENT_COLUMNS = ["Student ID", "Course Code"]
+
+
+def read_enrolments(filepath):
+    """
+    Read a student enrolment sheet (.xlsx or .csv) with one row per enrolment
+    and the columns "Student ID" and "Course Code".
+    Returns a dict: student -> list of course codes.
+    Raises ValueError if either column is missing.
+    """
+    if filepath.lower().endswith(".csv"):
+        df = pd.read_csv(filepath, dtype=str)
+    else:
+        df = pd.read_excel(filepath, dtype=str)
+    missing = [col for col in ENROLMENT_COLUMNS if col not in df.columns]
+    if missing:
+        raise ValueError(f"enrolment sheet has no {' / '.join(missing)} column "
+                         f"(expected {', '.join(ENROLMENT_COLUMNS)})")
+    df = df[ENROLMENT_COLUMNS].dropna()
+
+    enrolments = {}
+    students = df["Student ID"].str.strip()
+    codes = df["Course Code"].str.strip()
+    for student, code in zip(students, codes):
+        if student and code:
+            enrolments.setdefault(student, []).append(code)
+    return enrolments
+
+
+def build_conflict_graph(enrolments):
+    """
+    Build the course conflict graph from student enrolments.
+    Returns (codes, adjacency) where codes is the list of course codes and
+    adjacency[i] is the set of indices of courses sharing a student with codes[i].
+    """
+    index = {}
+    codes = []
+    adjacency = []
+    for chosen in enrolments.values():
+        ids = []
+        for code in set(chosen):
+            i = index.get(code)
+            if i is None:
+                i = index[code] = len(codes)
+                codes.append(code)
+                adjacency.append(set())
+            ids.append(i)
+        # Every pair of courses taken by the same student conflicts
+        for a in range(len(ids)):
+            adj_a = adjacency[ids[a]]
+            for b in range(a + 1, len(ids)):
+                adj_a.add(ids[b])
+                adjacency[ids[b]].add(ids[a])
+    return codes, adjacency
+
+
+def dsatur_coloring(adjacency, max_colors=None):
+    """
+    Colour the graph with DSATUR: repeatedly colour the uncoloured vertex whose
+    neighbours already use the most distinct colours (ties broken by degree),
+    giving it the smallest colour not used by a neighbour.
+
+    Returns a list of colours, one per vertex. When `max_colors` is given,
+    vertices that would need a further colour are left at -1.
+    """
+    n = len(adjacency)
+    colors = [-1] * n
+    done = [False] * n
+    saturation = [set() for _ in range(n)]
+
+    # Lazy max-heap of (-saturation, -degree, vertex); stale entries are skipped on pop.
+    heap = [(0, -len(adjacency[v]), v) for v in range(n)]
+    heapq.heapify(heap)
+
+    while heap:
+        neg_sat, _, v = heapq.heappop(heap)
+        if done[v] or -neg_sat != len(saturation[v]):
+            continue
+        done[v] = True
+
+        used = saturation[v]
+        color = 0
+        while color in used:
+            color += 1
+        if max_colors is not None and color >= max_colors:
+            continue  # no band left for this course
+        colors[v] = color
+
+        for u in adjacency[v]:
+            if not done[u] and color not in saturation[u]:
+                saturation[u].add(color)
+                heapq.heappush(heap, (-len(saturation[u]), -len(adjacency[u]), u))
+
+    return colors
+
+
+def meeting_days(sessions, n_days):
+    """
+    Indices of the days an elective with `sessions` weekly sessions meets on,
+    spread over the week (e.g. 2 of 5 -> MON and WED).
+    """
+    sessions = max(1, min(sessions, n_days))
+    return {round(i * n_days / sessions) for i in range(sessions)}
+
+
+def schedule_electives(timetable, minor_slots, enrolments, sessions=None):
+    """
+    Fill the minor slots of `timetable` with the electives from `enrolments`.
+    Each minor slot is one band; a cell lists every elective of its band that
+    meets on that day, e.g. "CS401 / MA410". `sessions` gives the weekly
+    sessions per elective code; electives missing from it meet every day.
+    Returns the list of electives that did not fit.
+    """
+    sessions = sessions or {}
+    codes, adjacency = build_conflict_graph(enrolments)
+    colors = dsatur_coloring(adjacency, max_colors=len(minor_slots))
+
+    bands = [[] for _ in minor_slots]
+    unplaced = []
+    for code, color in zip(codes, colors):
+        if color < 0:
+            unplaced.append(code)
+        else:
+            bands[color].append(code)
+
+    days = list(timetable)
+    for slot, band in zip(minor_slots, bands):
+        on_day = [[] for _ in days]
+        for code in band:
+            for d in meeting_days(sessions.get(code, len(days)), len(days)):
+                on_day[d].append(code)
+        for day, codes_today in zip(days, on_day):
+            if codes_today and slot in timetable[day]:
+                timetable[day][slot] = " / ".join(sorted(codes_today))
+
+    return sorted(unplaced)
@@ -0,0 +1,161 @@
+"""
+Randomized fuzz harness for the scheduler.
+
+Generates random course sheets, slot layouts and (sometimes) elective
+enrolments, runs every registered engine with every app's HS205 rule on
+each of them, validates each timetable with validator.py and times each run.
+
+    python fuzz.py --runs 2000 --seed 1 --budget-ms 50
+
+Exits with status 1 if any run takes longer than its latency budget
+(and, with --fail-on-violations, if any timetable has a hard violation, see
+validator.HARD_VIOLATIONS; the random sheets often cannot be placed in
+full, so the *_count kinds are expected).
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+
+import scheduler
+import validator
+
+# Per-engine latency budgets in milliseconds; --budget-ms overrides them all
+BUDGETS_MS = {
+    "random": 25.0,
+    "greedy": 25.0,
+    "exact": 500.0,
+}
+
+# HS205 rules of the three apps: app.py, app2.py, app3.py
+HS205_RULES = [["FRI", "WED"], ["FRI"], None]
+
+
+def _fmt(hours):
+    return f"{int(hours):02d}:{int(round((hours % 1) * 60)):02d}"
+
+
+def random_slots(rng):
+    """
+    A random day layout in 24h form: minor, lecture, morning break, tutorial,
+    lunch break, lab and HS205 slots laid out back to back from 07:00 or 08:00.
+    """
+    plan = []
+    n_minor = rng.randint(0, 2)
+    plan += [("minor", 1.0)] * min(n_minor, 1)
+    plan += [("lecture", 1.5)] * rng.randint(1, 4)
+    plan += [("morning_break", 0.5)]
+    plan += [("tutorial", 1.0)] * rng.randint(0, 2)
+    plan += [("lunch_break", 1.0)]
+    plan += [("lab", 2.0)] * rng.randint(0, 2)
+    plan += [("hs205_slot", 1.5)]
+    plan += [("minor", 1.0)] * (n_minor - 1 if n_minor > 1 else 0)
+
+    slots = {"lecture": [], "tutorial": [], "lab": [], "minor": [], "hs205_days": rng.choice(HS205_RULES)}
+    t = rng.choice([7.0, 8.0])
+    for kind, length in plan:
+        label = f"{_fmt(t)} - {_fmt(t + length)}"
+        if kind in ("morning_break", "lunch_break", "hs205_slot"):
+            slots[kind] = label
+        else:
+            slots[kind].append(label)
+        t += length
+    return slots
+
+
+def random_courses(rng):
+    """
+    A random course sheet; sometimes with HS205 and a malformed credit string.
+    """
+    courses = []
+    for i in range(rng.randint(1, 12)):
+        L = rng.randint(0, 4)
+        T = rng.randint(0, 2)
+        P = rng.choice([0, 0, 1, 2, 2, 3, 4])
+        credits = f"{L}-{T}-{P}-0-{L + T + P // 2}"
+        if rng.random() < 0.03:
+            credits = rng.choice(["", "3-1-0", "x-y-z-0-0"])
+        courses.append({"Course Code": f"FZ{i:03d}", "Credits (L-T-P-S-C)": credits})
+    if rng.random() < 0.5:
+        courses.append({"Course Code": "HS205", "Credits (L-T-P-S-C)": "3-0-0-0-3"})
+    return courses
+
+
+def random_enrolments(rng):
+    """
+    Random elective choices: up to 300 students picking 1-3 of up to 15 electives.
+    """
+    codes = [f"EL{i:03d}" for i in range(rng.randint(1, 15))]
+    enrolments = {}
+    for s in range(rng.randint(1, 300)):
+        enrolments[f"S{s:04d}"] = rng.sample(codes, min(len(codes), rng.randint(1, 3)))
+    return enrolments
+
+
+def run_fuzz(runs, seed=0, budget_ms=None, engines=None):
+    """
+    Run `runs` random cases through every engine. Returns a dict per engine:
+    {"latencies_ms": [...], "violations": {kind: count}, "over_budget": [(case, ms)]}.
+    """
+    rng = random.Random(seed)
+    engines = engines or list(scheduler.ENGINES)
+    results = {name: {"latencies_ms": [], "violations": {}, "over_budget": []} for name in engines}
+
+    for case in range(runs):
+        slots = random_slots(rng)
+        courses = random_courses(rng)
+        enrolments = random_enrolments(rng) if slots["minor"] and rng.random() < 0.5 else None
+
+        for name in engines:
+            start = time.perf_counter()
+            timetable, _ = scheduler.schedule_courses(courses, {}, slots, enrolments, engine=name, seed=case)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+
+            result = results[name]
+            result["latencies_ms"].append(elapsed_ms)
+            budget = budget_ms if budget_ms is not None else BUDGETS_MS.get(name, 100.0)
+            if elapsed_ms > budget:
+                result["over_budget"].append((case, elapsed_ms))
+            for kind, n in validator.count_by_kind(
+                    validator.validate_timetable(timetable, courses, slots, enrolments)).items():
+                result["violations"][kind] = result["violations"].get(kind, 0) + n
+
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fuzz every scheduler engine and validate its output")
+    parser.add_argument("--runs", type=int, default=1000, help="number of random cases")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--budget-ms", type=float, default=None,
+                        help="latency budget per run for every engine (default: per-engine BUDGETS_MS)")
+    parser.add_argument("--engine", action="append", choices=sorted(scheduler.ENGINES),
+                        help="only fuzz this engine (repeatable)")
+    parser.add_argument("--fail-on-violations", action="store_true",
+                        help="also fail when any timetable has a hard violation")
+    args = parser.parse_args(argv)
+
+    results = run_fuzz(args.runs, args.seed, args.budget_ms, args.engine)
+
+    failed = False
+    for name, result in results.items():
+        lat = sorted(result["latencies_ms"])
+        p95 = lat[min(len(lat) - 1, int(len(lat) * 0.95))]
+        print(f"{name:8s} runs={len(lat)} p50={statistics.median(lat):.2f}ms "
+              f"p95={p95:.2f}ms max={lat[-1]:.2f}ms over_budget={len(result['over_budget'])}")
+        for kind, n in sorted(result["violations"].items()):
+            hard = " (hard)" if kind in validator.HARD_VIOLATIONS else ""
+            print(f"           {kind:18s} {n}{hard}")
+        if result["over_budget"]:
+            failed = True
+            case, ms = max(result["over_budget"], key=lambda x: x[1])
+            print(f"           slowest over budget: case {case} took {ms:.2f}ms")
+        if args.fail_on_violations and any(k in validator.HARD_VIOLATIONS for k in result["violations"]):
+            failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
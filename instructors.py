@@ -0,0 +1,193 @@
+"""
+Instructor availability and workload constraints.
+
+Every instructor has a weekly bitmask with one bit per 15-minute unit
+(5 days x 96 units). Booking a session sets the bits of its slot, so the
+checks made for each candidate cell are a few integer operations whatever
+the timetable size:
+
+  - clash:        busy & slot_bits
+  - availability: blocked & slot_bits
+  - hours/day:    popcount(busy & day_bits)
+  - consecutive:  popcount of session starts inside the busy run around the slot
+
+One InstructorIndex is shared by all sections scheduled in the same run, so
+an instructor teaching two sections is never placed in both at once.
+
+The instructor column is "Faculty" (or "Instructor"); several names are
+separated by "/", and a name marked "(Lab)" only takes that course's labs.
+The optional "Availability" sheet lists, per instructor, the windows they
+are available in (columns "Faculty", "Day", "Time", e.g. "09:00 - 13:00");
+instructors not listed there are available all week. A window that is not
+on a weekday or not a 24h range is rejected with ValueError, since it would
+otherwise leave the instructor blocked all week.
+"""
+from openpyxl import load_workbook
+import pandas as pd
+
+from scheduler import DAYS, slot_bounds_24h
+
+UNIT_MINUTES = 15
+UNITS_PER_DAY = 24 * 60 // UNIT_MINUTES
+WEEK_UNITS = UNITS_PER_DAY * len(DAYS)
+DAY_MASKS = [((1 << UNITS_PER_DAY) - 1) << (i * UNITS_PER_DAY) for i in range(len(DAYS))]
+WEEK_MASK = (1 << WEEK_UNITS) - 1
+
+INSTRUCTOR_COLUMNS = ["Faculty", "Instructor"]
+
+
+def course_instructors(course):
+    """
+    Return {"lecture": [...], "tutorial": [...], "lab": [...]} for a course row.
+    """
+    raw = None
+    for col in INSTRUCTOR_COLUMNS:
+        value = course.get(col)
+        if isinstance(value, str) and value.strip():
+            raw = value
+            break
+    teachers = {"lecture": [], "tutorial": [], "lab": []}
+    if raw is None:
+        return teachers
+
+    for part in raw.split("/"):
+        name = part.strip()
+        if not name:
+            continue
+        if name.lower().endswith("(lab)"):
+            teachers["lab"].append(name[:-len("(lab)")].strip())
+        else:
+            for kind in teachers:
+                teachers[kind].append(name)
+    return teachers
+
+
+def check_window(name, day, window):
+    """
+    Raise ValueError unless `window` is a 24h "HH:MM - HH:MM" range on one of DAYS.
+    """
+    if day not in DAYS or slot_bounds_24h(window) is None:
+        raise ValueError(f"availability of {name}: {day} {window!r} is not a weekday "
+                         f"({', '.join(DAYS)}) with a 24h 'HH:MM - HH:MM' window")
+
+
+def read_availability(filepath, sheet_name="Availability"):
+    """
+    Read the availability sheet into {instructor: list of (day, "HH:MM - HH:MM")}.
+    Returns {} if the workbook has no such sheet; raises ValueError for a row
+    whose window does not parse (see check_window).
+    """
+    wb = load_workbook(filepath, read_only=True)
+    has_sheet = sheet_name in wb.sheetnames
+    wb.close()
+    if not has_sheet:
+        return {}
+
+    df = pd.read_excel(filepath, sheet_name=sheet_name, dtype=str)
+    availability = {}
+    for _, row in df.dropna(subset=["Faculty", "Day", "Time"]).iterrows():
+        name, day, window = row["Faculty"].strip(), row["Day"].strip().upper()[:3], row["Time"].strip()
+        check_window(name, day, window)
+        availability.setdefault(name, []).append((day, window))
+    return availability
+
+
+class InstructorIndex:
+    """
+    Weekly busy bitmasks per instructor, with optional workload limits.
+    """
+
+    def __init__(self, availability=None, max_hours_per_day=None, max_consecutive=None):
+        self.max_units_per_day = None
+        if max_hours_per_day:
+            self.max_units_per_day = int(max_hours_per_day * 60 // UNIT_MINUTES)
+        self.max_consecutive = max_consecutive or None
+        self.busy = {}      # name -> bits of booked units
+        self.starts = {}    # name -> bit at the first unit of each booked session
+        self.blocked = {}   # name -> bits of units the instructor is not available
+        self.exempt = set()  # names only checked for clashes (e.g. rooms), not workload
+        self._slots = {}    # (day, slot) -> (bits, first unit, end unit, day index)
+        self._labels = {}   # slots that are not 24h ranges -> private bit position
+
+        for name, windows in (availability or {}).items():
+            available = 0
+            for day, window in windows:
+                check_window(name, day, window)
+                available |= self.slot_bits(day, window)[0]
+            self.blocked[name] = WEEK_MASK & ~available
+
+    def slot_bits(self, day, slot):
+        """
+        Bits of `slot` on `day`. Slots that are not 24h "HH:MM - HH:MM" ranges
+        (e.g. "9:00 - 10:30 AM") get a private bit above the week, so they
+        still clash with themselves but take no part in the workload limits.
+        """
+        key = (day, slot)
+        cached = self._slots.get(key)
+        if cached is not None:
+            return cached
+
+        d = DAYS.index(day)
+        bounds = slot_bounds_24h(slot)
+        if bounds is None:
+            label_id = self._labels.setdefault(slot, len(self._labels))
+            bit = WEEK_UNITS + label_id * len(DAYS) + d
+            cached = (1 << bit, None, None, d)
+        else:
+            first = d * UNITS_PER_DAY + int(bounds[0] * 60 // UNIT_MINUTES)
+            end = d * UNITS_PER_DAY + int(-(-bounds[1] * 60 // UNIT_MINUTES))
+            end = min(end, (d + 1) * UNITS_PER_DAY)
+            cached = ((1 << end) - (1 << first), first, end, d)
+        self._slots[key] = cached
+        return cached
+
+    def _fits(self, name, bits, first, end, d):
+        busy = self.busy.get(name, 0)
+        if (busy | self.blocked.get(name, 0)) & bits:
+            return False
+        if first is None or name in self.exempt:
+            return True
+
+        if self.max_units_per_day is not None:
+            used = bin(busy & DAY_MASKS[d]).count("1")
+            if used + (end - first) > self.max_units_per_day:
+                return False
+
+        if self.max_consecutive is not None:
+            day_start = d * UNITS_PER_DAY
+            day_end = day_start + UNITS_PER_DAY
+            # Extend [first, end) over the busy units directly before and after it
+            free_below = ~busy & ((1 << first) - 1) & DAY_MASKS[d]
+            left = free_below.bit_length() if free_below else day_start
+            free_above = (~busy & DAY_MASKS[d]) >> end
+            right = end + ((free_above & -free_above).bit_length() - 1) if free_above else day_end
+            run = ((1 << right) - (1 << left))
+            if bin(self.starts.get(name, 0) & run).count("1") + 1 > self.max_consecutive:
+                return False
+        return True
+
+    def teachers_of(self, course):
+        return course_instructors(course)
+
+    def can_place(self, names, day, slot):
+        """
+        True if every instructor in `names` can take a session in `slot` on `day`.
+        """
+        if not names:
+            return True
+        bits, first, end, d = self.slot_bits(day, slot)
+        return all(self._fits(name, bits, first, end, d) for name in names)
+
+    def book(self, names, day, slot):
+        bits, first, _, _ = self.slot_bits(day, slot)
+        for name in names:
+            self.busy[name] = self.busy.get(name, 0) | bits
+            if first is not None:
+                self.starts[name] = self.starts.get(name, 0) | (1 << first)
+
+    def release(self, names, day, slot):
+        bits, first, _, _ = self.slot_bits(day, slot)
+        for name in names:
+            self.busy[name] = self.busy.get(name, 0) & ~bits
+            if first is not None:
+                self.starts[name] = self.starts.get(name, 0) & ~(1 << first)
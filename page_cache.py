@@ -0,0 +1,80 @@
+"""
+Cache for the rendered timetable page.
+
+The timetable page only changes when a new timetable is generated, so the
+rendered HTML is kept per timetable version, together with a gzip copy and
+a strong ETag for each of the two representations. Repeated hits then cost
+a dictionary lookup instead of a full template render, and clients that
+already hold the page get a 304 with no body.
+"""
+import gzip
+import hashlib
+import threading
+
+from flask import request, make_response
+
+# Only the latest few versions are worth keeping; older ones are never served again.
+MAX_VERSIONS = 4
+
+_pages = {}
+_lock = threading.Lock()
+
+
+def get_page(version, render):
+    """
+    Return the cached entry for `version`, calling `render()` to build it on a miss.
+    An entry holds the raw and gzipped bodies and one ETag for each of them.
+    """
+    with _lock:
+        entry = _pages.get(version)
+    if entry is not None:
+        return entry
+
+    body = render().encode("utf-8")
+    digest = hashlib.sha256(body).hexdigest()[:32]
+    entry = {
+        "body": body,
+        "gzip": gzip.compress(body, compresslevel=9),
+        "etag": digest,
+        "gzip_etag": digest + "-gz",  # different bytes, so a different strong ETag
+    }
+    with _lock:
+        _pages[version] = entry
+        while len(_pages) > MAX_VERSIONS:
+            del _pages[min(_pages)]  # versions only ever increase
+    return entry
+
+
+def invalidate(keep=None):
+    """
+    Drop every cached page except the one for `keep` (if given).
+    """
+    with _lock:
+        for version in list(_pages):
+            if version != keep:
+                del _pages[version]
+
+
+def cached_response(version, render):
+    """
+    Build the response for the current request from the cache, honouring
+    If-None-Match and Accept-Encoding.
+    """
+    entry = get_page(version, render)
+
+    use_gzip = request.accept_encodings["gzip"] > 0
+    etag = entry["gzip_etag"] if use_gzip else entry["etag"]
+
+    if request.if_none_match.contains(etag):
+        response = make_response("", 304)
+    else:
+        response = make_response(entry["gzip"] if use_gzip else entry["body"])
+        response.mimetype = "text/html"
+        if use_gzip:
+            response.headers["Content-Encoding"] = "gzip"
+
+    response.set_etag(etag)
+    response.headers["Vary"] = "Accept-Encoding"
+    # Always revalidate: the page changes as soon as a new timetable is uploaded.
+    response.headers["Cache-Control"] = "no-cache"
+    return response
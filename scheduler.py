@@ -0,0 +1,804 @@
+"""
+Common scheduler used by app.py, app2.py and app3.py.
+
+Each app describes its day as a `slots` dict:
+
+    {
+        "lecture":  ["09:00 - 10:30", "11:00 - 12:30"],
+        "tutorial": ["12:30 - 13:30"],
+        "lab":      ["14:30 - 16:30"],
+        "minor":    ["08:00 - 09:00"],       # electives only (see electives.py)
+        "morning_break": "10:30 - 11:00",
+        "lunch_break":   "13:30 - 14:30",
+        "hs205_slot": "17:00 - 18:30",
+        "hs205_days": None,                  # None = one random day, or e.g. ["WED", "FRI"]
+        "order": None,                       # None = sort by 24h start time, or an explicit list
+    }
+
+and calls schedule_courses(), which places HS205 and the electives and then
+hands the L/T/P sessions to one of the registered engines:
+
+  random  - the original randomised placement (cheap, fine for small, loose inputs)
+  greedy  - most-constrained-first placement, linear in the number of sessions
+  exact   - branch-and-bound search that finds a full placement when one exists
+            (or the largest partial one) on small, tight inputs
+
+With engine="auto" the engine is chosen from the problem size and tightness
+using the per-engine cost model in COST_MODEL (see calibrate()). A run can
+be given a deadline and a cancel callback; it then returns the best
+timetable found in time (see schedule_courses()).
+"""
+import argparse
+import math
+import random
+import statistics
+import time
+
+import electives
+
+DAYS = ["MON", "TUE", "WED", "THU", "FRI"]
+
+# Labels written into the timetable cells for each kind of session
+LABELS = {
+    "lecture": "{}",
+    "tutorial": "{}_TUT",
+    "lab": "{}_LAB(2hrs)",
+}
+
+# Labs are the scarcest, so every engine places them first
+KIND_ORDER = ["lab", "lecture", "tutorial"]
+
+MAX_ATTEMPTS = 50  # retry limit of the random engine, per course
+
+MAX_RESTARTS = 100      # engine restarts within one deadline (see schedule_courses)
+BASELINE_ENGINE = "greedy"  # first run under a deadline, so even a short one returns a fair timetable
+CANCEL_POLL_EVERY = 64  # stop checks between two calls of the (slower) cancel callback
+
+# The day layout of index.html's defaults, for callers without a form
+DEFAULT_SLOTS = {
+    "lecture": ["09:00 - 10:30", "11:00 - 12:30"],
+    "tutorial": ["12:30 - 13:30"],
+    "lab": ["14:30 - 16:30"],
+    "minor": [],
+    "morning_break": "10:30 - 11:00",
+    "lunch_break": "13:30 - 14:30",
+    "hs205_slot": "17:00 - 18:30",
+    "hs205_days": None,
+}
+
+
+# ------------------------------
+# UTILITY: Parse Credits / Times
+# ------------------------------
+def parse_credits(credit_str):
+    """
+    Parse a credit string of the form "L-T-P-S-C" and return (L, T, P, S, C).
+    If parsing fails, return zeros.
+    """
+    try:
+        L_str, T_str, P_str, S_str, C_str = credit_str.split('-')
+        return int(L_str), int(T_str), int(P_str), int(S_str), int(C_str)
+    except:
+        return 0, 0, 0, 0, 0
+
+
+def parse_time_24h(time_str):
+    """
+    Parse a single 24-hour time string like '09:00' or '17:30' -> float (9.0, 17.5, etc.)
+    If invalid, return 0.0
+    """
+    time_str = time_str.strip()  # e.g. "09:00"
+    if ':' not in time_str:
+        return 0.0
+    hhmm = time_str.split(':')
+    if len(hhmm) != 2:
+        return 0.0
+    hh = int(hhmm[0])
+    mm = int(hhmm[1])
+    return hh + mm/60.0
+
+
+def parse_time_range_24h(slot_str):
+    """
+    Parse a slot like '09:00 - 10:30' (24h format).
+    We'll extract the start time substring and parse it with parse_time_24h.
+    If we can't parse, return 0.0
+    """
+    slot_str = slot_str.strip()  # e.g. "09:00 - 10:30"
+    parts = slot_str.split('-')
+    if len(parts) != 2:
+        return 0.0
+    start_part = parts[0].strip()  # "09:00"
+    return parse_time_24h(start_part)
+
+
+def slot_bounds_24h(slot_str):
+    """
+    Return (start, end) in hours for a slot like '09:00 - 10:30' -> (9.0, 10.5),
+    or None if the slot is not in 24h "HH:MM - HH:MM" form.
+    """
+    parts = slot_str.split('-')
+    if len(parts) != 2:
+        return None
+    try:
+        start = parse_time_24h(parts[0])
+        end = parse_time_24h(parts[1])
+    except ValueError:
+        return None
+    if end <= start:
+        return None
+    return start, end
+
+
+def course_code(course):
+    return str(course.get("Course Code", "")).strip()
+
+
+def sessions_needed(course):
+    """
+    Return {"lab": n, "lecture": n, "tutorial": n} for one course row.
+    Each lab slot covers 2 hours of P; lectures use L-1 slots (1.5h slots for L hours).
+    """
+    L, T, P, _, _ = parse_credits(course.get("Credits (L-T-P-S-C)", "0-0-0-0-0"))
+    return {
+        "lab": P // 2 if P >= 2 else P,
+        "lecture": L - 1,
+        "tutorial": T,
+    }
+
+
+def minor_slot_hours(slots):
+    """
+    Length in hours of the minor slots (the first one that parses, else 1).
+    """
+    for slot in slots.get("minor", []):
+        bounds = slot_bounds_24h(slot)
+        if bounds:
+            return bounds[1] - bounds[0]
+    return 1.0
+
+
+def elective_sessions(course, slot_hours):
+    """
+    Minor-slot sessions an elective needs per week: its L+T+P contact hours
+    over the minor slot length, at most one a day. An elective without
+    credits meets every day.
+    """
+    L, T, P, _, _ = parse_credits(course.get("Credits (L-T-P-S-C)", "0-0-0-0-0"))
+    hours = L + T + P
+    if hours <= 0:
+        return len(DAYS)
+    return min(len(DAYS), math.ceil(hours / slot_hours - 1e-9))
+
+
+# ------------------------------
+# PROBLEM SETUP
+# ------------------------------
+def day_slots(slots):
+    """
+    Return the ordered list of slot labels making up one day.
+    """
+    if slots.get("order"):
+        all_slots = list(slots["order"])
+    else:
+        all_slots = []
+        all_slots.extend(slots.get("minor", []))
+        all_slots.extend(slots.get("lecture", []))
+        all_slots.append(slots["morning_break"])
+        all_slots.extend(slots.get("tutorial", []))
+        all_slots.append(slots["lunch_break"])
+        all_slots.extend(slots.get("lab", []))
+        all_slots = sorted(all_slots, key=lambda s: parse_time_range_24h(s))
+
+    hs205_slot = slots.get("hs205_slot")
+    if hs205_slot and hs205_slot not in all_slots:
+        all_slots.append(hs205_slot)
+        if not slots.get("order"):
+            all_slots = sorted(all_slots, key=lambda s: parse_time_range_24h(s))
+    return all_slots
+
+
+def empty_timetable(slots, all_slots):
+    timetable = {}
+    for d in DAYS:
+        timetable[d] = {}
+        for slot in all_slots:
+            if slot == slots.get("morning_break"):
+                timetable[d][slot] = "Morning Break"
+            elif slot == slots.get("lunch_break"):
+                timetable[d][slot] = "Lunch Break"
+            else:
+                timetable[d][slot] = ""
+    return timetable
+
+
+def build_problem(courses, slots, skip_codes=()):
+    """
+    Collect the L/T/P sessions to place as a list of (code, kind, count).
+    HS205 and the codes in `skip_codes` (electives) are handled separately.
+    """
+    requests = []
+    for c in courses:
+        code = course_code(c)
+        if not code or code.upper() == "HS205" or code in skip_codes:
+            continue
+        needed = sessions_needed(c)
+        for kind in KIND_ORDER:
+            if needed[kind] > 0:
+                requests.append((code, kind, needed[kind]))
+
+    return {
+        "slots": {kind: list(slots.get(kind, [])) for kind in KIND_ORDER},
+        "requests": requests,
+    }
+
+
+def problem_stats(problem):
+    """
+    Size and tightness of a problem. Tightness is the worst demand/capacity
+    ratio over the lab, lecture and tutorial slots (above 1.0 cannot fit).
+    """
+    sessions = 0
+    cells = 0
+    tightness = 0.0
+    for kind in KIND_ORDER:
+        demand = sum(n for _, k, n in problem["requests"] if k == kind)
+        capacity = len(DAYS) * len(problem["slots"][kind])
+        sessions += demand
+        cells += capacity
+        if demand:
+            tightness = max(tightness, demand / capacity if capacity else float("inf"))
+    return {"sessions": sessions, "cells": cells, "tightness": tightness}
+
+
+def day_allows(kind, code, labels):
+    """
+    Same-day rules shared by all engines, given the set of labels already on that day:
+    a lab never shares a day with a lecture or another lab of the course,
+    and lectures / tutorials are at most one per day each.
+    """
+    if kind == "lab":
+        return code not in labels and LABELS["lab"].format(code) not in labels
+    return LABELS[kind].format(code) not in labels
+
+
+def teachers_free(problem, code, kind, day, slot):
+    """
+    True if the course's instructors for this kind of session can take the cell
+    (always true when no instructor index is in use).
+    """
+    index = problem.get("instructors")
+    return index is None or index.can_place(problem["teachers"][code][kind], day, slot)
+
+
+def book_teachers(problem, code, kind, day, slot, release=False):
+    index = problem.get("instructors")
+    if index is None:
+        return
+    if release:
+        index.release(problem["teachers"][code][kind], day, slot)
+    else:
+        index.book(problem["teachers"][code][kind], day, slot)
+
+
+def stop_requested(problem):
+    """
+    True once the run's deadline has passed or its caller cancelled it
+    (see schedule_courses); engines poll this and return what they have.
+    """
+    stop = problem.get("stop")
+    return stop is not None and stop()
+
+
+# ------------------------------
+# ENGINES
+# ------------------------------
+ENGINES = {}
+
+
+def register_engine(name, work):
+    """
+    Register a scheduling engine. `work(stats)` returns the engine's work
+    estimate for a problem; multiplied by COST_MODEL[name] it gives milliseconds.
+    The engine itself is called as engine(problem, timetable, rng) and fills
+    the L/T/P sessions into `timetable` in place, checking teachers_free() and
+    calling book_teachers() for every cell it uses. It should poll
+    stop_requested() and return early, keeping what it placed, when it is set.
+    """
+    def decorator(fn):
+        ENGINES[name] = {"run": fn, "work": work}
+        return fn
+    return decorator
+
+
+@register_engine("random", work=lambda s: s["sessions"] * s["cells"] * (1 + 4 * min(s["tightness"], 1.0)))
+def random_engine(problem, timetable, rng):
+    """
+    The original placement: for each course, shuffle the days and slots and
+    take the first free cell, retrying up to MAX_ATTEMPTS times.
+    """
+    days = list(DAYS)
+    labels = {d: set(timetable[d].values()) for d in DAYS}
+
+    for kind in KIND_ORDER:
+        kind_slots = list(problem["slots"][kind])
+        for code, k, count in problem["requests"]:
+            if k != kind:
+                continue
+            if stop_requested(problem):
+                return
+            label = LABELS[kind].format(code)
+            needed = count
+            attempts = 0
+            while needed > 0 and attempts < MAX_ATTEMPTS:
+                attempts += 1
+                rng.shuffle(days)
+                rng.shuffle(kind_slots)
+                placed = False
+                for d in days:
+                    if not day_allows(kind, code, labels[d]):
+                        continue
+                    for slot in kind_slots:
+                        if slot in timetable[d] and timetable[d][slot] == "" \
+                                and teachers_free(problem, code, kind, d, slot):
+                            timetable[d][slot] = label
+                            labels[d].add(label)
+                            book_teachers(problem, code, kind, d, slot)
+                            needed -= 1
+                            placed = True
+                            break
+                    if placed:
+                        break
+                if not placed:
+                    break  # a full pass found nothing, retrying cannot help
+
+
+@register_engine("greedy", work=lambda s: s["sessions"] * len(DAYS))
+def greedy_engine(problem, timetable, rng):
+    """
+    Most-constrained-first placement: labs, then lectures, then tutorials;
+    within a kind the courses needing the most sessions go first, and each
+    session goes to the allowed day with the most free cells left.
+    """
+    labels = {d: set(timetable[d].values()) for d in DAYS}
+    free = {}
+    for kind in KIND_ORDER:
+        free[kind] = {d: [s for s in problem["slots"][kind] if timetable[d].get(s) == ""] for d in DAYS}
+
+    for kind in KIND_ORDER:
+        requests = [r for r in problem["requests"] if r[1] == kind]
+        rng.shuffle(requests)  # random tie-break between equally demanding courses
+        requests.sort(key=lambda r: -r[2])
+        for code, _, count in requests:
+            label = LABELS[kind].format(code)
+            for _ in range(count):
+                if stop_requested(problem):
+                    return
+                best, best_slot = None, None
+                for d in DAYS:
+                    if not free[kind][d] or not day_allows(kind, code, labels[d]):
+                        continue
+                    if best is not None and len(free[kind][d]) <= len(free[kind][best]):
+                        continue
+                    for s in free[kind][d]:
+                        if teachers_free(problem, code, kind, d, s):
+                            best, best_slot = d, s
+                            break
+                if best is None:
+                    break
+                free[kind][best].remove(best_slot)
+                timetable[best][best_slot] = label
+                labels[best].add(label)
+                book_teachers(problem, code, kind, best, best_slot)
+
+
+EXACT_NODE_LIMIT = 20000
+
+
+class _SearchLimit(Exception):
+    pass
+
+
+@register_engine("exact", work=lambda s: s["sessions"] ** 2 * s["cells"])
+def exact_engine(problem, timetable, rng):
+    """
+    Branch-and-bound search over all sessions, always branching on the session
+    with the fewest free cells left. Stops at the first full placement; otherwise
+    keeps the largest partial placement found, which is optimal when the search
+    finishes within EXACT_NODE_LIMIT nodes and EXACT_BUDGET_MS (and before
+    stop_requested()). When it stops early without a full placement, a greedy
+    run is tried too and the better of the two is kept.
+    """
+    time_limit = time.perf_counter() + EXACT_BUDGET_MS / 1000
+    sessions = []
+    for code, kind, count in problem["requests"]:
+        sessions.extend([(code, kind)] * count)
+
+    labels = {d: set(timetable[d].values()) for d in DAYS}
+    cells = {kind: [(d, s) for d in DAYS for s in problem["slots"][kind] if timetable[d].get(s) == ""]
+             for kind in KIND_ORDER}
+    taken = set()
+    used = {kind: 0 for kind in KIND_ORDER}
+    chosen = []
+    best = []
+    nodes = [0]
+
+    def candidates(code, kind):
+        return [(d, s) for d, s in cells[kind]
+                if (d, s) not in taken and day_allows(kind, code, labels[d])
+                and teachers_free(problem, code, kind, d, s)]
+
+    def bound(remaining):
+        # No kind can take more sessions than it has free cells
+        left = {kind: 0 for kind in KIND_ORDER}
+        for i in remaining:
+            left[sessions[i][1]] += 1
+        return sum(min(n, len(cells[kind]) - used[kind]) for kind, n in left.items())
+
+    def search(remaining):
+        nodes[0] += 1
+        if nodes[0] > EXACT_NODE_LIMIT or time.perf_counter() > time_limit or stop_requested(problem):
+            raise _SearchLimit()
+        if len(chosen) > len(best):
+            best[:] = chosen
+        if len(best) == len(sessions):
+            return True
+        if len(chosen) + bound(remaining) <= len(best):
+            return False  # cannot beat the best placement found so far
+
+        pick, pick_cells = None, None
+        for i in remaining:
+            options = candidates(*sessions[i])
+            if pick is None or len(options) < len(pick_cells):
+                pick, pick_cells = i, options
+                if not options:
+                    break
+        rest = [i for i in remaining if i != pick]
+        if not pick_cells:
+            return search(rest)  # this session cannot be placed on this branch
+
+        rng.shuffle(pick_cells)
+        code, kind = sessions[pick]
+        label = LABELS[kind].format(code)
+        for d, s in pick_cells:
+            taken.add((d, s))
+            used[kind] += 1
+            labels[d].add(label)
+            book_teachers(problem, code, kind, d, s)
+            chosen.append((d, s, code, kind))
+            if search(rest):
+                return True
+            chosen.pop()
+            book_teachers(problem, code, kind, d, s, release=True)
+            labels[d].discard(label)
+            used[kind] -= 1
+            taken.discard((d, s))
+        return False
+
+    stopped_early = False
+    try:
+        search(list(range(len(sessions))))
+    except _SearchLimit:
+        stopped_early = True
+
+    # The instructors still hold the bookings of the branch the search stopped in
+    for d, s, code, kind in chosen:
+        book_teachers(problem, code, kind, d, s, release=True)
+
+    if stopped_early and len(best) < len(sessions):
+        fallback = {d: dict(timetable[d]) for d in DAYS}
+        greedy_engine(problem, fallback, rng)
+        filled = [(d, s) for d in DAYS for s in fallback[d] if fallback[d][s] != timetable[d][s]]
+        if len(filled) > len(best):
+            for d, s in filled:
+                timetable[d][s] = fallback[d][s]
+            return
+        labels = {LABELS[kind].format(code): (code, kind) for code, kind in set(sessions)}
+        for d, s in filled:
+            book_teachers(problem, *labels[fallback[d][s]], d, s, release=True)
+
+    for d, s, code, kind in best:
+        timetable[d][s] = LABELS[kind].format(code)
+        book_teachers(problem, code, kind, d, s)
+
+
+# ------------------------------
+# ENGINE SELECTION
+# ------------------------------
+# Milliseconds per unit of engine work, as measured by calibrate()
+COST_MODEL = {
+    "random": 0.00005,
+    "greedy": 0.001,
+    "exact": 0.00025,
+}
+
+SMALL_PROBLEM_SESSIONS = 40  # below this the random engine is cheap enough
+LOOSE_TIGHTNESS = 0.6        # the random engine rarely misses a session below this
+TIGHT_TIGHTNESS = 0.85       # from here up to 1.0 (full) an exact search is worth its cost
+EXACT_BUDGET_MS = 200.0      # largest estimated cost we accept for the exact engine, and its time limit
+
+
+def estimate_costs(stats):
+    return {name: COST_MODEL.get(name, 1.0) * engine["work"](stats) for name, engine in ENGINES.items()}
+
+
+def choose_engine(problem):
+    """
+    Pick an engine for `problem`. Returns (name, reason, stats, estimates).
+    """
+    stats = problem_stats(problem)
+    estimates = estimate_costs(stats)
+
+    if stats["sessions"] <= SMALL_PROBLEM_SESSIONS and stats["tightness"] <= LOOSE_TIGHTNESS:
+        return "random", "small and loose", stats, estimates
+    if TIGHT_TIGHTNESS <= stats["tightness"] <= 1.0 and estimates["exact"] <= EXACT_BUDGET_MS:
+        return "exact", "tight, exact search within budget", stats, estimates
+
+    eligible = ["greedy"]
+    if stats["tightness"] <= LOOSE_TIGHTNESS:
+        eligible.append("random")
+    name = min(eligible, key=lambda n: estimates[n])
+    return name, "lowest estimated cost", stats, estimates
+
+
+def summarize(problem, timetable):
+    """
+    Count placed sessions against the requests.
+    Returns (placed, required, unplaced) where unplaced lists (code, kind, missing).
+    """
+    counts = {}
+    for d in DAYS:
+        for val in timetable[d].values():
+            if val:
+                counts[val] = counts.get(val, 0) + 1
+
+    placed = 0
+    required = 0
+    unplaced = []
+    for code, kind, count in problem["requests"]:
+        got = min(counts.get(LABELS[kind].format(code), 0), count)
+        placed += got
+        required += count
+        if got < count:
+            unplaced.append((code, kind, count - got))
+    return placed, required, unplaced
+
+
+# ------------------------------
+# SCHEDULING FUNCTION
+# ------------------------------
+def _filled_cells(timetable, base, sessions):
+    """
+    The (day, slot, code, kind) cells an engine run filled in, given the
+    timetable it started from and {label: (code, kind)} of the L/T/P sessions.
+    """
+    for d in DAYS:
+        for s, val in timetable[d].items():
+            if val and val != base[d].get(s) and val in sessions:
+                yield (d, s) + sessions[val]
+
+
+def schedule_courses(courses, color_map, slots, enrolments=None, engine="auto", seed=None,
+                     instructors=None, deadline_ms=None, cancel=None):
+    """
+    Build one section's timetable.
+
+    1) Lay out the day from `slots` (see the module docstring).
+    2) Place electives in the minor slots if student enrolments are given,
+       on as many days as their credits need (see elective_sessions).
+    3) Place HS205 in the HS205 slot, on `hs205_days` or on one random day.
+    4) Place the lab, lecture and tutorial sessions with `engine`
+       ("auto", or any name in ENGINES). With an `instructors` index
+       (instructors.InstructorIndex) every placement also respects the
+       instructors' availability, workload limits and their other bookings;
+       pass the same index for every section scheduled in one run.
+
+    With `deadline_ms` a greedy run gives a baseline first; then the engine
+    is run and restarted (with fresh random choices) until every session is
+    placed or the deadline passes, and the best timetable found so far is
+    returned ("result_engine" in the report says which engine built it). An
+    engine still running at the deadline stops early and keeps what it has
+    placed. `cancel` is an
+    optional callable polled during the run; once it returns True the run
+    stops the same way (e.g. when the client has disconnected).
+
+    Raises ValueError for an unknown engine name.
+
+    Returns (timetable, report); the report says which engine ran and why,
+    how many sessions were placed (and the quality, placed / required),
+    what is still unplaced, and whether the run timed out or was cancelled.
+    """
+    if engine != "auto" and engine not in ENGINES:
+        raise ValueError(f"unknown engine {engine!r}, expected 'auto' or one of {', '.join(sorted(ENGINES))}")
+    rng = random.Random(seed)
+    all_slots = day_slots(slots)
+    timetable = empty_timetable(slots, all_slots)
+
+    # Electives live in the minor slots only, never in the regular L/T/P slots
+    elective_codes = set()
+    unplaced_electives = []
+    if enrolments:
+        for chosen in enrolments.values():
+            elective_codes.update(chosen)
+        hours = minor_slot_hours(slots)
+        weekly = {course_code(c): elective_sessions(c, hours) for c in courses
+                  if course_code(c) in elective_codes}
+        unplaced_electives = electives.schedule_electives(timetable, slots.get("minor", []),
+                                                          enrolments, weekly)
+
+    hs205_slot = slots.get("hs205_slot")
+    if hs205_slot and any(course_code(c).upper() == "HS205" for c in courses):
+        hs205_days = slots.get("hs205_days")
+        if not hs205_days:
+            free_days = [d for d in DAYS if timetable[d][hs205_slot] == ""]
+            hs205_days = [rng.choice(free_days)] if free_days else []
+        for d in hs205_days:
+            timetable[d][hs205_slot] = "HS205"
+
+    problem = build_problem(courses, slots, skip_codes=elective_codes)
+    if instructors is not None:
+        # HS205 is one combined class for all sections, so it books nobody
+        problem["instructors"] = instructors
+        problem["teachers"] = {course_code(c): instructors.teachers_of(c) for c in courses}
+    if engine == "auto":
+        engine, reason, stats, estimates = choose_engine(problem)
+    else:
+        reason = "requested"
+        stats = problem_stats(problem)
+        estimates = estimate_costs(stats)
+
+    start = time.perf_counter()
+    deadline = None if deadline_ms is None else start + deadline_ms / 1000
+    stopped = {"timed_out": False, "cancelled": False}
+    polls = [0]
+
+    def should_stop():
+        if stopped["cancelled"]:
+            return True
+        if deadline is not None and time.perf_counter() >= deadline:
+            stopped["timed_out"] = True
+            return True
+        polls[0] += 1
+        if cancel is not None and polls[0] % CANCEL_POLL_EVERY == 0 and cancel():
+            stopped["cancelled"] = True
+            return True
+        return False
+
+    # Under a deadline a greedy run (linear, about a millisecond) comes first
+    # and is not cut short; the chosen engine then uses the rest of the budget
+    # to improve on it
+    runs = [engine]
+    if deadline is not None and engine != BASELINE_ENGINE:
+        runs = [BASELINE_ENGINE, engine]
+
+    # No run can place more sessions of a kind than that kind has free cells
+    ceiling = 0
+    for kind in KIND_ORDER:
+        wanted = sum(count for _, k, count in problem["requests"] if k == kind)
+        free = sum(1 for d in DAYS for s in problem["slots"][kind] if timetable[d].get(s) == "")
+        ceiling += min(wanted, free)
+
+    base = {d: dict(timetable[d]) for d in DAYS}
+    sessions = {LABELS[kind].format(code): (code, kind) for code, kind, _ in problem["requests"]}
+    best, best_placed, best_engine, attempts = None, -1, None, 0
+    while True:
+        name = runs[min(attempts, len(runs) - 1)]
+        attempts += 1
+        if name == engine and (deadline is not None or cancel is not None):
+            problem["stop"] = should_stop
+        run = {d: dict(base[d]) for d in DAYS}
+        ENGINES[name]["run"](problem, run, rng)
+        placed = summarize(problem, run)[0]
+        if placed > best_placed:
+            best, best_placed, best_engine = run, placed, name
+        # Each run gives its bookings back; the best one books them again below
+        for d, s, code, kind in _filled_cells(run, base, sessions):
+            book_teachers(problem, code, kind, d, s, release=True)
+        if deadline is None or placed >= ceiling or attempts >= MAX_RESTARTS:
+            break
+        if should_stop():
+            break
+        if cancel is not None and cancel():
+            stopped["cancelled"] = True
+            break
+
+    for d, s, code, kind in _filled_cells(best, base, sessions):
+        book_teachers(problem, code, kind, d, s)
+    timetable = best
+    problem.pop("stop", None)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    # Make sure each course (and each elective) has a color
+    for c in courses:
+        c_code = course_code(c)
+        if c_code not in color_map or not color_map[c_code]:
+            color_map[c_code] = "#FFD700"
+    for c_code in elective_codes:
+        if not color_map.get(c_code):
+            color_map[c_code] = "#FFD700"
+
+    placed, required, unplaced = summarize(problem, timetable)
+    report = {
+        "engine": engine,
+        "reason": reason,
+        "elapsed_ms": elapsed_ms,
+        "estimated_ms": estimates.get(engine),
+        "stats": stats,
+        "placed": placed,
+        "required": required,
+        "unplaced": unplaced,
+        "unplaced_electives": unplaced_electives,
+        "quality": placed / required if required else 1.0,
+        "deadline_ms": deadline_ms,
+        "attempts": attempts,
+        "result_engine": best_engine,
+        "timed_out": stopped["timed_out"] and placed < required,
+        "cancelled": stopped["cancelled"],
+    }
+    return timetable, report
+
+
+# ------------------------------
+# COST MODEL CALIBRATION
+# ------------------------------
+CALIBRATION_SLOTS = {
+    "lecture": ["09:00 - 10:30", "11:00 - 12:30"],
+    "tutorial": ["12:30 - 13:30"],
+    "lab": ["14:30 - 16:30", "16:30 - 18:30"],
+    "minor": [],
+    "morning_break": "10:30 - 11:00",
+    "lunch_break": "13:30 - 14:30",
+}
+
+
+def synthetic_courses(rng, n_courses):
+    """
+    Random course rows shaped like the uploaded sheets.
+    """
+    courses = []
+    for i in range(n_courses):
+        L = rng.choice([2, 3, 3, 4])
+        T = rng.choice([0, 1])
+        P = rng.choice([0, 0, 2])
+        courses.append({
+            "Course Code": f"XX{i:03d}",
+            "Credits (L-T-P-S-C)": f"{L}-{T}-{P}-0-{L + T + P // 2}",
+        })
+    return courses
+
+
+def calibrate(trials=5, seed=0):
+    """
+    Time every engine on synthetic problems of several sizes and set
+    COST_MODEL[name] to the median milliseconds per unit of work.
+    Returns the updated COST_MODEL.
+    """
+    rng = random.Random(seed)
+    samples = {name: [] for name in ENGINES}
+    for n_courses in (2, 4, 6, 8):
+        for _ in range(trials):
+            courses = synthetic_courses(rng, n_courses)
+            problem = build_problem(courses, CALIBRATION_SLOTS)
+            stats = problem_stats(problem)
+            for name, engine in ENGINES.items():
+                work = engine["work"](stats)
+                if not work:
+                    continue
+                timetable = empty_timetable(CALIBRATION_SLOTS, day_slots(CALIBRATION_SLOTS))
+                start = time.perf_counter()
+                engine["run"](problem, timetable, random.Random(rng.random()))
+                samples[name].append((time.perf_counter() - start) * 1000 / work)
+
+    for name, values in samples.items():
+        if values:
+            COST_MODEL[name] = statistics.median(values)
+    return COST_MODEL
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Scheduler engine utilities")
+    parser.add_argument("--calibrate", action="store_true", help="measure and print the engine cost model")
+    args = parser.parse_args()
+    if args.calibrate:
+        for name, ms in sorted(calibrate().items()):
+            print(f"{name:8s} {ms:.6f} ms/unit")
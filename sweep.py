@@ -0,0 +1,245 @@
+"""
+What-if sweep over slot layouts.
+
+Takes one course sheet and a grid of day layouts (number and timing of
+lecture / tutorial / lab / minor slots, break times, the HS205 slot, ...),
+schedules the sheet under every layout on a process pool and returns a
+comparison matrix, best layout first.
+
+The grid is a JSON file (or the "grid" field of POST /sweep in app3.py):
+
+    {
+      "base": {"lab": ["14:30 - 16:30"]},                     # optional, over scheduler.DEFAULT_SLOTS
+      "grid": {
+        "lecture": [["09:00 - 10:30", "11:00 - 12:30"],
+                    ["07:30 - 09:00", "09:00 - 10:30", "11:00 - 12:30"]],
+        "hs205_slot": ["17:00 - 18:30", "18:30 - 20:00"]
+      }
+    }
+
+or an explicit list: {"configs": [{"name": "A", "slots": {...}}, ...]}.
+Every grid axis is a list of choices. lecture / tutorial / lab / minor take
+lists of "HH:MM - HH:MM" slots, morning_break / lunch_break / hs205_slot a
+single slot and hs205_days a list of days (or null). A spec that expands
+to more than MAX_CONFIGS layouts is refused.
+A layout whose schedulable slots overlap in time (say a lecture at
+15:00 - 16:30 next to a lab at 14:30 - 16:30) could put two sessions of a
+section at once; each overlapping pair counts as a hard violation, so such
+a layout is never feasible.
+
+    python sweep.py uploads/timetable_structure.xlsx grid.json --repeats 5 --csv out.csv
+"""
+import argparse
+import csv
+import itertools
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import catalog_cache
+import scheduler
+import validator
+
+SLOT_LISTS = ("lecture", "tutorial", "lab", "minor")
+SINGLE_SLOTS = ("morning_break", "lunch_break", "hs205_slot")
+MAX_CONFIGS = 64
+MAX_REPEATS = 20
+
+COLUMNS = ["config", "feasible", "placed", "required", "coverage", "hard_violations",
+           "overlaps", "gaps", "score", "engine", "ms"]
+
+
+def _short(value):
+    if isinstance(value, list):
+        return f"{len(value)} slot" if len(value) == 1 else f"{len(value)} slots"
+    return str(value)
+
+
+def _is_slot(value):
+    return isinstance(value, str) and scheduler.slot_bounds_24h(value) is not None
+
+
+def check_layout_value(key, value):
+    """
+    Raise ValueError unless `value` is a valid setting for slots[key].
+    """
+    if key in SLOT_LISTS:
+        if not isinstance(value, list) or not all(_is_slot(v) for v in value):
+            raise ValueError(f"{key} must be a list of 'HH:MM - HH:MM' slots, got {value!r}")
+    elif key in SINGLE_SLOTS:
+        if not _is_slot(value):
+            raise ValueError(f"{key} must be one 'HH:MM - HH:MM' slot, got {value!r}")
+    elif key == "hs205_days":
+        if value is not None and (not isinstance(value, list) or not set(value) <= set(scheduler.DAYS)):
+            raise ValueError(f"hs205_days must be a list of {', '.join(scheduler.DAYS)} or null, got {value!r}")
+    else:
+        raise ValueError(f"unknown slot setting: {key!r}")
+
+
+def _layout(slots, where):
+    if not isinstance(slots, dict):
+        raise ValueError(f"{where} must be an object of slot settings")
+    for key, value in slots.items():
+        check_layout_value(key, value)
+    return dict(scheduler.DEFAULT_SLOTS, **slots)
+
+
+def expand_grid(spec):
+    """
+    Turn a grid spec (see the module docstring) into a list of (name, slots).
+    Raises ValueError for a malformed spec or one with more than MAX_CONFIGS layouts.
+    """
+    if not isinstance(spec, dict):
+        raise ValueError("grid spec must be a JSON object")
+    unknown = set(spec) - {"base", "grid", "configs"}
+    if unknown:
+        raise ValueError(f"unknown grid spec keys: {', '.join(sorted(unknown))}")
+
+    if "configs" in spec:
+        configs = spec["configs"]
+        if not isinstance(configs, list) or not all(isinstance(c, dict) for c in configs):
+            raise ValueError("configs must be a list of {\"name\": ..., \"slots\": {...}} objects")
+        if len(configs) > MAX_CONFIGS:
+            raise ValueError(f"{len(configs)} configs, at most {MAX_CONFIGS} allowed")
+        return [(str(c.get("name", f"config {i + 1}")), _layout(c.get("slots"), f"configs[{i}].slots"))
+                for i, c in enumerate(configs)]
+
+    base = _layout(spec.get("base", {}), "base")
+    grid = spec.get("grid", {})
+    if not isinstance(grid, dict):
+        raise ValueError("grid must be an object of axis -> list of choices")
+    total = 1
+    for key, choices in grid.items():
+        if not isinstance(choices, list) or not choices:
+            raise ValueError(f"grid axis {key} must be a non-empty list of choices, got {choices!r}")
+        for value in choices:
+            check_layout_value(key, value)
+        total *= len(choices)
+    if total > MAX_CONFIGS:
+        raise ValueError(f"grid expands to {total} layouts, at most {MAX_CONFIGS} allowed")
+
+    keys = list(grid)
+    configs = []
+    for choice in itertools.product(*(range(len(grid[k])) for k in keys)):
+        slots = dict(base)
+        parts = []
+        for key, i in zip(keys, choice):
+            slots[key] = grid[key][i]
+            if len(grid[key]) > 1:
+                parts.append(f"{key}#{i + 1}={_short(grid[key][i])}")
+        configs.append((", ".join(parts) or "base", slots))
+    return configs
+
+
+def idle_gaps(timetable):
+    """
+    Empty cells between a day's first and last session, summed over the week
+    (breaks do not count).
+    """
+    gaps = 0
+    for day_slots in timetable.values():
+        cells = [val for val in day_slots.values() if val not in ("Morning Break", "Lunch Break")]
+        used = [i for i, val in enumerate(cells) if val]
+        if used:
+            gaps += sum(1 for val in cells[used[0]:used[-1] + 1] if not val)
+    return gaps
+
+
+def evaluate(name, slots, courses, repeats, engine, seed, deadline_ms=None):
+    """
+    Schedule `courses` under one layout `repeats` times and keep the best run.
+    Runs in a worker process. Returns one row of the comparison matrix.
+    """
+    overlaps = len(validator.overlapping_slots(slots))
+    best = None
+    for r in range(repeats):
+        start = time.perf_counter()
+        timetable, report = scheduler.schedule_courses(courses, {}, slots, engine=engine, seed=seed + r,
+                                                      deadline_ms=deadline_ms)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        violations = validator.validate_timetable(timetable, courses, slots)
+        hard = overlaps + sum(1 for v in violations if v["kind"] in validator.HARD_VIOLATIONS)
+        coverage = report["placed"] / report["required"] if report["required"] else 1.0
+        gaps = idle_gaps(timetable)
+        row = {
+            "config": name,
+            "feasible": report["placed"] == report["required"] and hard == 0,
+            "placed": report["placed"],
+            "required": report["required"],
+            "coverage": round(coverage, 3),
+            "hard_violations": hard,
+            "overlaps": overlaps,
+            "gaps": gaps,
+            # Coverage dominates; then hard violations; idle gaps break ties
+            "score": round(100 * coverage - 10 * hard - gaps / len(scheduler.DAYS), 2),
+            "engine": report["engine"],
+            "ms": round(elapsed_ms, 2),
+        }
+        if best is None or row["score"] > best["score"]:
+            best = row
+    return best
+
+
+def run_sweep(courses, configs, repeats=3, engine="auto", workers=None, seed=0, deadline_ms=None):
+    """
+    Evaluate every (name, slots) in `configs` in parallel and return the
+    comparison matrix as a list of rows, best score first. `deadline_ms`
+    bounds each scheduling run (see scheduler.schedule_courses).
+    """
+    jobs = [(name, slots, courses, repeats, engine, seed, deadline_ms) for name, slots in configs]
+    if len(jobs) <= 1 or workers == 1:
+        rows = [evaluate(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            rows = list(pool.map(evaluate, *zip(*jobs)))
+    return sorted(rows, key=lambda row: -row["score"])
+
+
+def write_csv(rows, fh):
+    writer = csv.DictWriter(fh, fieldnames=COLUMNS)
+    writer.writeheader()
+    writer.writerows(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare slot layouts for one course sheet")
+    parser.add_argument("workbook", help="course sheet (.xlsx)")
+    parser.add_argument("grid", help="JSON grid of slot layouts")
+    parser.add_argument("--repeats", type=int, default=3, help="runs per layout; the best one counts")
+    parser.add_argument("--engine", default="auto", choices=["auto"] + sorted(scheduler.ENGINES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--deadline-ms", type=float, default=None, help="time budget of each run")
+    parser.add_argument("--csv", help="also write the matrix to this CSV file ('-' for stdout)")
+    args = parser.parse_args(argv)
+    if not 1 <= args.repeats <= MAX_REPEATS:
+        parser.error(f"--repeats must be between 1 and {MAX_REPEATS}")
+
+    courses, _ = catalog_cache.load_catalog(args.workbook)
+    with open(args.grid) as fh:
+        try:
+            configs = expand_grid(json.load(fh))
+        except ValueError as e:
+            parser.error(f"invalid grid: {e}")
+
+    start = time.perf_counter()
+    rows = run_sweep(courses, configs, args.repeats, args.engine, args.workers, args.seed,
+                     args.deadline_ms)
+    print(f"{len(configs)} layouts x {args.repeats} runs in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    for row in rows:
+        print(f"{row['score']:7.2f}  {'ok ' if row['feasible'] else 'NO '} "
+              f"{row['placed']:3d}/{row['required']:<3d} gaps={row['gaps']:<3d} "
+              f"hard={row['hard_violations']:<2d} {row['config']}")
+
+    if args.csv == "-":
+        write_csv(rows, sys.stdout)
+    elif args.csv:
+        with open(args.csv, "w", newline="") as fh:
+            write_csv(rows, fh)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,36 @@
+import analytics
+import scheduler
+
+
+def timetable(cells):
+    tt = scheduler.empty_timetable(scheduler.DEFAULT_SLOTS, scheduler.day_slots(scheduler.DEFAULT_SLOTS))
+    for (day, slot), label in cells.items():
+        tt[day][slot] = label
+    return tt
+
+
+def save(root, section, term, cells, room="C104"):
+    analytics.save_timetable(section, term, timetable(cells), {}, {}, room=room, root=str(root))
+
+
+def test_rooms_count_clashes_within_a_term_only(tmp_path):
+    save(tmp_path, "A", "T1", {("MON", "09:00 - 10:30"): "CS101"})
+    save(tmp_path, "B", "T2", {("MON", "09:00 - 10:30"): "CS201"})
+    rows = analytics.rooms(analytics.load(str(tmp_path)))
+    assert [(r["term"], r["clashes"]) for r in rows] == [("T1", 0), ("T2", 0)]
+
+    save(tmp_path, "C", "T1", {("MON", "09:00 - 10:30"): "CS301"})
+    rows = analytics.rooms(analytics.load(str(tmp_path)))
+    assert [(r["term"], r["clashes"]) for r in rows] == [("T1", 1), ("T2", 0)]
+
+
+def test_views_of_one_term(tmp_path):
+    save(tmp_path, "A", "T1", {("MON", "09:00 - 10:30"): "CS101", ("TUE", "14:30 - 16:30"): "CS101_LAB(2hrs)"})
+    save(tmp_path, "B", "T2", {("MON", "11:00 - 12:30"): "CS201"})
+    stack = analytics.select(analytics.load(str(tmp_path)), "T1")
+    assert analytics.summary(stack)["sections"] == 1
+    assert [(r["slot"], r["TUE"]) for r in analytics.labs(stack)] == [("14:30 - 16:30", 1)]
+    load = analytics.section_load(stack)[0]
+    assert (load["MON"], load["TUE"], load["total"]) == (1.5, 2.0, 3.5)
+    heat = {r["slot"]: r["MON"] for r in analytics.heatmap(stack)}
+    assert heat["09:00 - 10:30"] == 1.0 and heat["11:00 - 12:30"] == 0.0
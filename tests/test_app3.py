@@ -0,0 +1,78 @@
+import io
+import json
+import os
+
+import pytest
+
+import app3
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORKBOOK = os.path.join(REPO, "uploads", "timetable_structure.xlsx")
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    # Uploads, the catalog cache and stored timetables all live under the cwd
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("uploads")
+    monkeypatch.setitem(app3.app.config, "UPLOAD_FOLDER", "uploads")
+    return app3.app.test_client()
+
+
+def workbook():
+    with open(WORKBOOK, "rb") as fh:
+        return io.BytesIO(fh.read()), "timetable.xlsx"
+
+
+def test_enrolment_sheet_without_columns_is_rejected(client):
+    data = {"excel_file": workbook(), "enrolment_file": (io.BytesIO(b"Roll,Course\nS1,EL1\n"), "e.csv")}
+    r = client.post("/upload", data=data, content_type="multipart/form-data")
+    assert r.status_code == 400
+    assert b"Student ID" in r.data
+
+
+def test_enrolment_file_cannot_overwrite_the_workbook(client):
+    data = {"excel_file": workbook(),
+            "enrolment_file": (io.BytesIO(b"Student ID,Course Code\nS1,EL1\n"), "timetable.xlsx")}
+    r = client.post("/upload", data=data, content_type="multipart/form-data")
+    assert r.status_code == 400  # CSV bytes under an .xlsx name do not parse
+    with open(os.path.join("uploads", "timetable.xlsx"), "rb") as fh, open(WORKBOOK, "rb") as orig:
+        assert fh.read() == orig.read()
+
+
+@pytest.mark.parametrize("form", [
+    {"grid": "[]"},
+    {"grid": "null"},
+    {"grid": "not json"},
+    {"grid": json.dumps({"grid": {"lecture": None}})},
+    {"grid": json.dumps({"grid": {"hs205_slot": "17:00 - 18:30"}})},
+    {"grid": json.dumps({"grid": {"lecture": [["09:00 - 10:30"]] * 100, "lab": [["14:30 - 16:30"]] * 100}})},
+    {"grid": "{}", "repeats": "0"},
+    {"grid": "{}", "repeats": "1000"},
+])
+def test_sweep_rejects_bad_requests(client, form):
+    r = client.post("/sweep", data=dict(form, excel_file=workbook()), content_type="multipart/form-data")
+    assert r.status_code == 400
+    assert not os.path.exists(os.path.join("uploads", "timetable.xlsx"))
+
+
+def test_sweep_compares_layouts(client):
+    grid = {"grid": {"hs205_slot": ["17:00 - 18:30", "18:30 - 20:00"]}}
+    form = {"grid": json.dumps(grid), "repeats": "1", "engine": "greedy", "excel_file": workbook()}
+    r = client.post("/sweep", data=form, content_type="multipart/form-data")
+    assert r.status_code == 200
+    assert len(r.get_json()) == 2
+
+
+def test_analytics_csv_needs_a_view(client):
+    r = client.get("/analytics?format=csv")
+    assert r.status_code == 400
+    assert b"heatmap" in r.data and b"rooms" in r.data
+
+    r = client.get("/analytics?view=bogus")
+    assert r.status_code == 400
+    assert b"heatmap" in r.data
+
+    r = client.get("/analytics?view=rooms&format=csv")
+    assert r.status_code == 200
+    assert r.mimetype == "text/csv"
@@ -0,0 +1,88 @@
+import os
+import shutil
+
+import pandas as pd
+import pytest
+from openpyxl import load_workbook
+
+import catalog_cache
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORKBOOK = os.path.join(REPO, "uploads", "timetable_structure.xlsx")
+
+
+@pytest.fixture
+def parses(monkeypatch):
+    """Count the workbook parses behind the cache."""
+    calls = []
+    write_entry = catalog_cache._write_entry
+
+    def counting(entry_dir, filepath, sha):
+        calls.append(filepath)
+        write_entry(entry_dir, filepath, sha)
+
+    monkeypatch.setattr(catalog_cache, "_write_entry", counting)
+    return calls
+
+
+def copy(tmp_path, sub, name="timetable.xlsx"):
+    os.makedirs(tmp_path / sub, exist_ok=True)
+    path = str(tmp_path / sub / name)
+    shutil.copy(WORKBOOK, path)
+    return path
+
+
+def entries(cache_dir):
+    return sorted(name for name in os.listdir(cache_dir))
+
+
+def test_second_load_is_a_cache_hit(tmp_path, parses):
+    path = copy(tmp_path, "a")
+    cache_dir = str(tmp_path / "cache")
+    courses, color_map = catalog_cache.load_catalog(path, cache_dir)
+    again, again_colors = catalog_cache.load_catalog(path, cache_dir)
+    assert parses == [path]
+    assert again_colors == color_map
+    assert [c["Course Code"] for c in again] == [c["Course Code"] for c in courses]
+
+    expected = pd.read_excel(path).to_dict("records")
+    assert [c["Course Code"] for c in courses] == [c["Course Code"] for c in expected]
+
+
+def test_same_name_in_other_directory_keeps_its_entry(tmp_path, parses):
+    cache_dir = str(tmp_path / "cache")
+    first = copy(tmp_path, "a")
+    catalog_cache.load_catalog(first, cache_dir)
+
+    second = copy(tmp_path, "b")
+    wb = load_workbook(second)
+    wb.active["A2"] = "changed"
+    wb.save(second)
+    catalog_cache.load_catalog(second, cache_dir)
+    assert len(entries(cache_dir)) == 2
+
+    catalog_cache.load_catalog(first, cache_dir)
+    assert parses == [first, second]
+
+
+def test_rewritten_file_drops_its_old_entry(tmp_path, parses):
+    cache_dir = str(tmp_path / "cache")
+    path = copy(tmp_path, "a")
+    catalog_cache.load_catalog(path, cache_dir)
+    old = entries(cache_dir)
+
+    wb = load_workbook(path)
+    wb.active["A2"] = "changed"
+    wb.save(path)
+    catalog_cache.load_catalog(path, cache_dir)
+    assert len(entries(cache_dir)) == 1
+    assert entries(cache_dir) != old
+
+
+def test_hash_memo_is_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(catalog_cache, "MAX_HASHES", 2)
+    monkeypatch.setattr(catalog_cache, "_hashes", catalog_cache.OrderedDict())
+    paths = [copy(tmp_path, "a", f"{i}.xlsx") for i in range(4)]
+    for p in paths:
+        catalog_cache.file_hash(p)
+    assert [key[0] for key in catalog_cache._hashes] == paths[2:]
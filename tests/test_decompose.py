@@ -0,0 +1,50 @@
+import numpy as np
+
+import decompose
+import scheduler
+from validator import classify
+
+
+def course(code, faculty, room=None):
+    return {"Course Code": code, "Credits (L-T-P-S-C)": "3-1-0-0-4", "Faculty": faculty, "Room No.": room}
+
+
+SECTIONS = {
+    "A": [course("A1", "Dr. X")],
+    "B": [course("B1", "Dr. X")],
+    "C": [course("C1", "Dr. C", 104.0)],
+    "D": [course("D1", "Dr. D", np.int64(104))],
+    "E": [course("E1", "Dr. E", float("nan"))],
+}
+
+
+def test_course_room_normalises_numbers():
+    assert decompose.course_room({"Room No.": 104.0}) == "104"
+    assert decompose.course_room({"Room No.": np.float64(104)}) == "104"
+    assert decompose.course_room({"Room No.": " C104 "}) == "C104"
+    assert decompose.course_room({"Room No.": 10.5}) == "10.5"
+    assert decompose.course_room({"Room No.": float("nan"), "Classroom": "C203"}) == "C203"
+    assert decompose.course_room({"Room No.": None}) is None
+
+
+def test_sections_sharing_an_instructor_or_room_are_one_component():
+    components = decompose.find_components(SECTIONS)
+    assert sorted(sorted(g) for g in components) == [["A", "B"], ["C", "D"], ["E"]]
+
+
+def test_components_merge_back_without_clashes():
+    sections = {name: (courses, {}) for name, courses in SECTIONS.items()}
+    inline = decompose.schedule_department(sections, scheduler.DEFAULT_SLOTS, engine="greedy", workers=1)
+    pooled = decompose.schedule_department(sections, scheduler.DEFAULT_SLOTS, engine="greedy", workers=2)
+    assert set(inline) == set(pooled) == set(SECTIONS)
+    for name, (timetable, _, report) in pooled.items():
+        assert report["placed"] == report["required"]
+        assert timetable == inline[name][0]
+
+    # A and B share Dr. X, C and D share room 104: never in the same cell
+    for pair in (("A", "B"), ("C", "D")):
+        for day in scheduler.DAYS:
+            for slot in pooled[pair[0]][0][day]:
+                cells = [pooled[name][0][day][slot] for name in pair]
+                busy = [c for c in cells if c and classify(c)[0] in ("A1", "B1", "C1", "D1")]
+                assert len(busy) <= 1, (day, slot, cells)
@@ -0,0 +1,66 @@
+import random
+
+import pytest
+
+import electives
+import scheduler
+import validator
+
+
+def random_enrolments(rng, students, courses, per_student):
+    codes = [f"EL{i:03d}" for i in range(courses)]
+    return {f"S{s}": rng.sample(codes, per_student) for s in range(students)}
+
+
+def test_dsatur_gives_a_proper_colouring():
+    rng = random.Random(0)
+    for _ in range(20):
+        enrolments = random_enrolments(rng, rng.randint(1, 200), rng.randint(3, 40), 3)
+        codes, adjacency = electives.build_conflict_graph(enrolments)
+        colors = electives.dsatur_coloring(adjacency)
+        assert all(c >= 0 for c in colors)
+        for v, neighbours in enumerate(adjacency):
+            assert all(colors[v] != colors[u] for u in neighbours)
+
+
+def test_dsatur_colours_a_clique_with_one_colour_each():
+    adjacency = [{j for j in range(5) if j != i} for i in range(5)]
+    assert sorted(electives.dsatur_coloring(adjacency)) == [0, 1, 2, 3, 4]
+    limited = electives.dsatur_coloring(adjacency, max_colors=3)
+    assert sorted(c for c in limited if c >= 0) == [0, 1, 2]
+    assert limited.count(-1) == 2
+
+
+def test_meeting_days_are_spread_and_distinct():
+    for n in range(1, 6):
+        days = electives.meeting_days(n, 5)
+        assert len(days) == n
+        assert all(0 <= d < 5 for d in days)
+    assert electives.meeting_days(2, 5) == {0, 2}
+
+
+def test_scheduled_electives_pass_the_validator():
+    slots = dict(scheduler.DEFAULT_SLOTS, minor=["07:00 - 08:00", "08:00 - 09:00"])
+    # A path EL000 - EL001 - EL002 - EL003 fits in two bands; EL004 clashes with all of them
+    enrolments = {"s1": ["EL000", "EL001"], "s2": ["EL001", "EL002"], "s3": ["EL002", "EL003"],
+                  "s4": ["EL004", "EL000", "EL001"]}
+    courses = [{"Course Code": "EL000", "Credits (L-T-P-S-C)": "2-0-0-0-2"}]
+    timetable, report = scheduler.schedule_courses(courses, {}, slots, enrolments, seed=0)
+
+    found = validator.validate_timetable(timetable, courses, slots, enrolments)
+    assert [v["kind"] for v in found] == ["elective_unplaced"]
+    assert report["unplaced_electives"] == ["EL004"]
+    cells = [timetable[d][s] for d in scheduler.DAYS for s in slots["minor"]]
+    assert sum("EL000" in cell for cell in cells) == 2   # 2 contact hours in 1h slots
+    assert sum("EL003" in cell for cell in cells) == 5   # not in the sheet: every day
+
+
+def test_read_enrolments_needs_both_columns(tmp_path):
+    good = tmp_path / "good.csv"
+    good.write_text("Student ID,Course Code\nS1,EL1\nS1,EL2\nS2,EL1\n")
+    assert electives.read_enrolments(str(good)) == {"S1": ["EL1", "EL2"], "S2": ["EL1"]}
+
+    bad = tmp_path / "bad.csv"
+    bad.write_text("Roll No,Course\nS1,EL1\n")
+    with pytest.raises(ValueError):
+        electives.read_enrolments(str(bad))
@@ -0,0 +1,5 @@
+import fuzz
+
+
+def test_fuzz_finds_no_hard_violations():
+    assert fuzz.main(["--runs", "60", "--seed", "3", "--budget-ms", "2000", "--fail-on-violations"]) == 0
@@ -0,0 +1,61 @@
+import pytest
+
+from instructors import InstructorIndex, course_instructors
+
+
+def test_course_instructors_splits_lab_only_names():
+    teachers = course_instructors({"Faculty": "Dr. A / Dr. B (Lab)"})
+    assert teachers == {"lecture": ["Dr. A"], "tutorial": ["Dr. A"], "lab": ["Dr. A", "Dr. B"]}
+
+
+def test_clash_and_release():
+    index = InstructorIndex()
+    assert index.can_place(["A"], "MON", "09:00 - 10:30")
+    index.book(["A"], "MON", "09:00 - 10:30")
+    assert not index.can_place(["A"], "MON", "10:00 - 11:00")  # overlaps
+    assert index.can_place(["A"], "MON", "10:30 - 11:30")      # back to back
+    assert index.can_place(["A"], "TUE", "09:00 - 10:30")
+    assert index.can_place(["B"], "MON", "09:00 - 10:30")
+    index.release(["A"], "MON", "09:00 - 10:30")
+    assert index.can_place(["A"], "MON", "10:00 - 11:00")
+
+
+def test_max_hours_per_day():
+    index = InstructorIndex(max_hours_per_day=3)
+    index.book(["A"], "MON", "09:00 - 10:30")
+    assert index.can_place(["A"], "MON", "11:00 - 12:30")     # 3.0 h
+    index.book(["A"], "MON", "11:00 - 12:30")
+    assert not index.can_place(["A"], "MON", "14:00 - 15:00")
+    assert index.can_place(["A"], "TUE", "14:00 - 15:00")
+
+
+def test_max_consecutive():
+    index = InstructorIndex(max_consecutive=2)
+    index.book(["A"], "MON", "09:00 - 10:00")
+    index.book(["A"], "MON", "10:00 - 11:00")
+    assert not index.can_place(["A"], "MON", "11:00 - 12:00")  # would be the third in a row
+    assert not index.can_place(["A"], "MON", "08:00 - 09:00")
+    assert index.can_place(["A"], "MON", "11:15 - 12:15")      # a gap breaks the run
+
+
+def test_availability_blocks_other_times():
+    index = InstructorIndex({"A": [("MON", "09:00 - 13:00")]})
+    assert index.can_place(["A"], "MON", "09:00 - 10:30")
+    assert not index.can_place(["A"], "MON", "12:30 - 14:00")
+    assert not index.can_place(["A"], "TUE", "09:00 - 10:30")
+    assert index.can_place(["B"], "TUE", "09:00 - 10:30")
+
+
+def test_rooms_are_exempt_from_workload():
+    index = InstructorIndex(max_hours_per_day=1)
+    index.exempt.add("room:C104")
+    index.book(["room:C104"], "MON", "09:00 - 10:30")
+    assert index.can_place(["room:C104"], "MON", "11:00 - 12:30")
+    assert not index.can_place(["room:C104"], "MON", "10:00 - 11:00")
+
+
+def test_unparseable_availability_is_rejected():
+    with pytest.raises(ValueError):
+        InstructorIndex({"A": [("MON", "9:00 - 12:00 PM")]})
+    with pytest.raises(ValueError):
+        InstructorIndex({"A": [("SAT", "09:00 - 12:00")]})
@@ -0,0 +1,68 @@
+import gzip
+
+import pytest
+from flask import Flask
+
+import page_cache
+
+
+@pytest.fixture
+def client():
+    page_cache.invalidate()
+    app = Flask(__name__)
+    state = {"version": 1, "renders": 0}
+
+    def render():
+        state["renders"] += 1
+        return f"<p>timetable v{state['version']}</p>"
+
+    @app.route("/timetable")
+    def timetable():
+        return page_cache.cached_response(state["version"], render)
+
+    yield app.test_client(), state
+    page_cache.invalidate()
+
+
+def test_first_get_has_a_strong_etag(client):
+    c, state = client
+    r = c.get("/timetable")
+    assert r.status_code == 200
+    assert r.data == b"<p>timetable v1</p>"
+    etag, weak = r.get_etag()
+    assert etag and not weak
+    assert r.headers["Cache-Control"] == "no-cache"
+
+
+def test_matching_if_none_match_gets_304(client):
+    c, state = client
+    etag = c.get("/timetable").get_etag()[0]
+    r = c.get("/timetable", headers={"If-None-Match": f'"{etag}"'})
+    assert r.status_code == 304
+    assert r.data == b""
+    assert state["renders"] == 1
+
+
+def test_gzip_variant(client):
+    c, _ = client
+    plain = c.get("/timetable")
+    r = c.get("/timetable", headers={"Accept-Encoding": "gzip"})
+    assert r.headers["Content-Encoding"] == "gzip"
+    assert r.headers["Vary"] == "Accept-Encoding"
+    assert r.get_etag()[0] == plain.get_etag()[0] + "-gz"
+    assert gzip.decompress(r.data) == plain.data
+    # The plain ETag does not validate the gzip representation
+    r = c.get("/timetable", headers={"Accept-Encoding": "gzip", "If-None-Match": f'"{plain.get_etag()[0]}"'})
+    assert r.status_code == 200
+
+
+def test_new_version_invalidates(client):
+    c, state = client
+    old = c.get("/timetable").get_etag()[0]
+    state["version"] = 2
+    page_cache.invalidate(keep=2)
+    r = c.get("/timetable", headers={"If-None-Match": f'"{old}"'})
+    assert r.status_code == 200
+    assert r.data == b"<p>timetable v2</p>"
+    assert r.get_etag()[0] != old
+    assert state["renders"] == 2
@@ -0,0 +1,47 @@
+import pytest
+
+import instructors
+import scheduler
+
+# Tight for the cost model (so "auto" picks exact) but not fully placeable:
+# three instructors with at most 3 teaching hours a day
+SLOTS = dict(scheduler.DEFAULT_SLOTS,
+             lecture=["06:30 - 08:00", "08:00 - 09:30", "09:30 - 11:00", "11:00 - 12:30"],
+             tutorial=["12:30 - 13:30"], lab=["14:30 - 16:30", "16:30 - 18:30"],
+             morning_break="06:00 - 06:30", hs205_slot="18:30 - 20:00")
+COURSES = [{"Course Code": f"C{i}", "Credits (L-T-P-S-C)": "3-0-2-0-0" if i < 8 else "2-0-0-0-0",
+            "Faculty": f"P{i % 3}"} for i in range(10)]
+
+
+def run(**kwargs):
+    index = instructors.InstructorIndex(max_hours_per_day=3)
+    return scheduler.schedule_courses(COURSES, {}, SLOTS, seed=1, instructors=index, **kwargs)
+
+
+def test_short_deadline_keeps_the_greedy_baseline():
+    _, greedy = run(engine="greedy")
+    _, report = run(deadline_ms=5)
+    assert report["engine"] == "exact"
+    assert report["timed_out"]
+    assert 0 < greedy["placed"] <= report["placed"]
+
+
+def test_exact_search_stops_at_its_budget(monkeypatch):
+    # Not fully placeable, so only the budget ends the search; the bound on
+    # elapsed time is a generous multiple that only a runaway search misses
+    monkeypatch.setattr(scheduler, "EXACT_BUDGET_MS", 20.0)
+    _, greedy = run(engine="greedy")
+    _, report = run(engine="exact")
+    assert not report["timed_out"]
+    assert 0 < greedy["placed"] <= report["placed"] < report["required"]
+    assert report["elapsed_ms"] < 50 * scheduler.EXACT_BUDGET_MS
+
+
+def test_cancel_stops_the_run():
+    _, report = run(engine="exact", cancel=lambda: True)
+    assert report["cancelled"]
+
+
+def test_unknown_engine_is_rejected():
+    with pytest.raises(ValueError):
+        run(engine="nope")
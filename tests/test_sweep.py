@@ -0,0 +1,53 @@
+import pytest
+
+import scheduler
+import sweep
+
+COURSES = [{"Course Code": f"X{i}", "Credits (L-T-P-S-C)": "2-1-2-0-3"} for i in range(2)]
+
+
+def test_overlapping_layout_is_not_feasible():
+    configs = [
+        ("plain", dict(scheduler.DEFAULT_SLOTS)),
+        ("overlap", dict(scheduler.DEFAULT_SLOTS, lecture=scheduler.DEFAULT_SLOTS["lecture"] + ["15:00 - 16:30"])),
+    ]
+    rows = {row["config"]: row for row in sweep.run_sweep(COURSES, configs, repeats=2, workers=1)}
+    assert rows["plain"]["feasible"] and rows["plain"]["overlaps"] == 0
+    assert not rows["overlap"]["feasible"]
+    assert rows["overlap"]["overlaps"] == 1
+    assert rows["overlap"]["score"] < rows["plain"]["score"]
+
+
+def test_expand_grid_names_each_choice():
+    spec = {"grid": {"hs205_slot": ["17:00 - 18:30", "18:30 - 20:00"]}}
+    names = [name for name, _ in sweep.expand_grid(spec)]
+    assert names == ["hs205_slot#1=17:00 - 18:30", "hs205_slot#2=18:30 - 20:00"]
+
+
+@pytest.mark.parametrize("spec", [
+    [],
+    None,
+    {"grid": {"lecture": None}},
+    {"grid": {"lecture": "09:00 - 10:30"}},
+    {"grid": {"lecture": []}},
+    {"grid": {"lecture": [["9 to 10"]]}},
+    {"grid": {"lunch_break": [["13:30 - 14:30"]]}},
+    {"grid": {"hs205_days": [["SUN"]]}},
+    {"grid": {"rooms": [1, 2]}},
+    {"base": {"lab": "14:30 - 16:30"}},
+    {"configs": [{"name": "A"}]},
+    {"configs": {"A": {}}},
+    {"grids": {}},
+])
+def test_expand_grid_rejects_malformed_specs(spec):
+    with pytest.raises(ValueError):
+        sweep.expand_grid(spec)
+
+
+def test_expand_grid_caps_the_number_of_layouts():
+    axis = [["09:00 - 10:30"], ["11:00 - 12:30"], ["07:30 - 09:00"], ["16:30 - 18:00"]]
+    spec = {"grid": {key: axis for key in sweep.SLOT_LISTS}}  # 4 ** 4 layouts
+    with pytest.raises(ValueError, match="at most"):
+        sweep.expand_grid(spec)
+    spec["grid"].pop("minor")
+    assert len(sweep.expand_grid(spec)) == 4 ** 3
@@ -0,0 +1,90 @@
+import scheduler
+import validator
+
+SLOTS = dict(scheduler.DEFAULT_SLOTS, hs205_days=["FRI"])
+COURSES = [
+    {"Course Code": "CS301", "Credits (L-T-P-S-C)": "3-1-2-0-4"},
+    {"Course Code": "HS205", "Credits (L-T-P-S-C)": "3-0-0-0-3"},
+]
+
+
+def timetable(cells):
+    tt = scheduler.empty_timetable(SLOTS, scheduler.day_slots(SLOTS))
+    for (day, slot), label in cells.items():
+        tt[day][slot] = label
+    return tt
+
+
+def valid_cells():
+    return {
+        ("MON", "09:00 - 10:30"): "CS301",
+        ("WED", "09:00 - 10:30"): "CS301",
+        ("TUE", "12:30 - 13:30"): "CS301_TUT",
+        ("THU", "14:30 - 16:30"): "CS301_LAB(2hrs)",
+        ("FRI", "17:00 - 18:30"): "HS205",
+    }
+
+
+def kinds(violations):
+    return sorted(v["kind"] for v in violations)
+
+
+def test_valid_timetable_has_no_violations():
+    assert validator.validate_timetable(timetable(valid_cells()), COURSES, SLOTS) == []
+
+
+def test_break_overwritten_and_wrong_slot():
+    cells = valid_cells()
+    cells[("MON", "10:30 - 11:00")] = "CS301_TUT"
+    del cells[("TUE", "12:30 - 13:30")]
+    cells[("TUE", "09:00 - 10:30")] = "CS301_TUT"
+    found = kinds(validator.validate_timetable(timetable(cells), COURSES, SLOTS))
+    assert "break_overwritten" in found
+    assert "wrong_slot" in found
+
+
+def test_repeated_on_day():
+    cells = valid_cells()
+    del cells[("WED", "09:00 - 10:30")]
+    cells[("MON", "11:00 - 12:30")] = "CS301"
+    assert "repeated_on_day" in kinds(validator.validate_timetable(timetable(cells), COURSES, SLOTS))
+
+
+def test_overlapping_slots_are_double_booked():
+    slots = dict(SLOTS, lecture=SLOTS["lecture"] + ["15:00 - 16:30"])
+    tt = scheduler.empty_timetable(slots, scheduler.day_slots(slots))
+    for (day, slot), label in valid_cells().items():
+        tt[day][slot] = label
+    tt["THU"]["15:00 - 16:30"] = "CS301"
+    tt["WED"]["09:00 - 10:30"] = ""
+    found = validator.validate_timetable(tt, COURSES, slots)
+    assert [(v["kind"], v["day"]) for v in found] == [("double_booked", "THU")]
+
+
+def test_counts_and_hs205():
+    cells = valid_cells()
+    del cells[("THU", "14:30 - 16:30")]
+    del cells[("FRI", "17:00 - 18:30")]
+    cells[("MON", "17:00 - 18:30")] = "HS205"
+    found = kinds(validator.validate_timetable(timetable(cells), COURSES, SLOTS))
+    assert found == ["hs205_placement", "lab_count"]
+
+
+def test_electives_double_booked_and_unplaced():
+    slots = dict(SLOTS, minor=["08:00 - 09:00"])
+    tt = scheduler.empty_timetable(slots, scheduler.day_slots(slots))
+    for (day, slot), label in valid_cells().items():
+        tt[day][slot] = label
+    for day in scheduler.DAYS:
+        tt[day]["08:00 - 09:00"] = "EL1 / EL2"
+    enrolments = {"s1": ["EL1", "EL2"], "s2": ["EL3"]}
+    found = kinds(validator.validate_timetable(tt, COURSES, slots, enrolments))
+    assert found == ["double_booked", "elective_unplaced"]
+
+
+
+def test_overlapping_slots_in_layout():
+    assert validator.overlapping_slots(SLOTS) == []
+    slots = dict(SLOTS, lecture=SLOTS["lecture"] + ["15:00 - 16:30"], lab=["14:30 - 16:30", "16:30 - 18:30"])
+    assert validator.overlapping_slots(slots) == [("14:30 - 16:30", "15:00 - 16:30"),
+                                                  ("16:30 - 18:30", "17:00 - 18:30")]
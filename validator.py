@@ -0,0 +1,243 @@
+"""
+Schedule validator.
+
+Checks a generated timetable against the course sheet and slot layout it was
+built from, in one pass over the cells plus one pass over the courses, and
+returns a list of violations. Each violation is a dict:
+
+    {"kind": "lecture_count", "course": "CS206", "day": None, "slot": None,
+     "detail": "2 lecture slots placed, L=4 needs 3"}
+
+Kinds:
+  break_overwritten   a break cell holds something else
+  wrong_slot          a session sits in a slot of the wrong kind
+  unknown_course      a cell names a course that is not in the sheet
+  repeated_on_day     the same session label appears twice on one day
+  double_booked       a student has two electives in the same minor slot, or two
+                      sessions of the section overlap in time (24h slots only)
+  lecture_count       lecture slots placed != hours of L over the slot length
+  lab_count           lab slots placed != P // 2 (or 1 for P = 1)
+  tutorial_count      tutorial slots placed != T
+  hs205_placement     HS205 missing, outside its slot, or on the wrong days
+  elective_unplaced   an enrolled elective has no minor slot
+  elective_count      an elective meets on a different number of days than its credits need
+"""
+import math
+
+from scheduler import (DAYS, LABELS, course_code, elective_sessions, minor_slot_hours, parse_credits,
+                       slot_bounds_24h)
+
+LECTURE_SLOT_HOURS = 1.5  # used when the lecture slots are not in 24h form
+
+# Violations that make a timetable unusable, as opposed to sessions left unplaced
+HARD_VIOLATIONS = {"break_overwritten", "wrong_slot", "repeated_on_day", "double_booked", "hs205_placement"}
+
+
+def _violation(kind, course=None, day=None, slot=None, detail=""):
+    return {"kind": kind, "course": course, "day": day, "slot": slot, "detail": detail}
+
+
+def classify(label):
+    """
+    Split a cell label into (code, kind), kind being "lecture", "tutorial",
+    "lab", "hs205" or "elective" (for "A / B" minor-slot bands).
+    """
+    if " / " in label:
+        return label, "elective"
+    if label == "HS205":
+        return label, "hs205"
+    lab_suffix = LABELS["lab"].format("")
+    tut_suffix = LABELS["tutorial"].format("")
+    if label.endswith(lab_suffix):
+        return label[:-len(lab_suffix)], "lab"
+    if label.endswith(tut_suffix):
+        return label[:-len(tut_suffix)], "tutorial"
+    return label, "lecture"
+
+
+def lecture_slot_hours(slots):
+    """
+    Length in hours of the lecture slots (the first one that parses).
+    """
+    for slot in slots.get("lecture", []):
+        bounds = slot_bounds_24h(slot)
+        if bounds:
+            return bounds[1] - bounds[0]
+    return LECTURE_SLOT_HOURS
+
+
+def overlapping_slots(slots):
+    """
+    Pairs of schedulable slots (lecture, tutorial, lab, minor and the HS205
+    slot) of a layout that overlap in time, as (earlier, later) labels.
+    Slots that are not in 24h form are not compared.
+    """
+    labels = set(slots.get("lecture", [])) | set(slots.get("tutorial", [])) | set(slots.get("lab", [])) \
+        | set(slots.get("minor", []))
+    if slots.get("hs205_slot"):
+        labels.add(slots["hs205_slot"])
+    timed = sorted((slot_bounds_24h(s), s) for s in labels if slot_bounds_24h(s))
+
+    pairs = []
+    for i, ((_, end), slot) in enumerate(timed):
+        for (start, _), other in timed[i + 1:]:
+            if start >= end:
+                break
+            pairs.append((slot, other))
+    return pairs
+
+
+def validate_timetable(timetable, courses, slots, enrolments=None):
+    """
+    Validate `timetable` (day -> {slot: label}) against the course rows and the
+    `slots` dict it was scheduled with (see scheduler.py). Returns a list of
+    violations; an empty list means the timetable is valid.
+    """
+    violations = []
+
+    breaks = {slots.get("morning_break"): "Morning Break", slots.get("lunch_break"): "Lunch Break"}
+    slot_kind = {}
+    for kind in ("lecture", "tutorial", "lab"):
+        for s in slots.get(kind, []):
+            slot_kind[s] = kind
+    minor_slots = set(slots.get("minor", []))
+    hs205_slot = slots.get("hs205_slot")
+
+    known = {course_code(c) for c in courses}
+    elective_codes = set()
+    if enrolments:
+        for chosen in enrolments.values():
+            elective_codes.update(chosen)
+
+    counts = {}        # (code, kind) -> number of cells
+    hs205_days = []
+    elective_slot = {}  # elective code -> minor slot it was given
+    elective_days = {}  # elective code -> number of days it meets
+
+    # 1) One pass over the cells
+    for day in DAYS:
+        seen = set()
+        timed = []  # (start, end, slot, label) of the day's sessions in 24h slots
+        for slot, label in timetable.get(day, {}).items():
+            if slot in breaks:
+                if label != breaks[slot]:
+                    violations.append(_violation("break_overwritten", day=day, slot=slot,
+                                                 detail=f"holds {label!r}"))
+                continue
+            if not label:
+                continue
+
+            if label in seen:
+                violations.append(_violation("repeated_on_day", classify(label)[0], day, slot,
+                                             f"{label} appears more than once on {day}"))
+            seen.add(label)
+            bounds = slot_bounds_24h(slot)
+            if bounds:
+                timed.append((bounds[0], bounds[1], slot, label))
+
+            code, kind = classify(label)
+            if kind == "hs205":
+                if slot != hs205_slot:
+                    violations.append(_violation("hs205_placement", code, day, slot,
+                                                 f"HS205 outside its slot {hs205_slot}"))
+                hs205_days.append(day)
+                continue
+            if kind == "elective":
+                if slot not in minor_slots:
+                    violations.append(_violation("wrong_slot", label, day, slot, "electives outside a minor slot"))
+                for elective in label.split(" / "):
+                    elective_slot[elective] = slot
+                    elective_days[elective] = elective_days.get(elective, 0) + 1
+                continue
+
+            if code in elective_codes and slot in minor_slots:
+                elective_slot[code] = slot  # a band with a single elective
+                elective_days[code] = elective_days.get(code, 0) + 1
+                continue
+            if code not in known:
+                violations.append(_violation("unknown_course", code, day, slot, f"{label} is not in the course sheet"))
+            elif slot_kind.get(slot) != kind:
+                violations.append(_violation("wrong_slot", code, day, slot,
+                                             f"{kind} in a {slot_kind.get(slot, 'non-schedulable')} slot"))
+            counts[(code, kind)] = counts.get((code, kind), 0) + 1
+
+        # Sessions in differently labelled slots that overlap in time
+        latest = None  # the session seen so far that ends last
+        for start, end, slot, label in sorted(timed):
+            if latest is not None and start < latest[1]:
+                violations.append(_violation("double_booked", classify(label)[0], day, slot,
+                                             f"{label} overlaps {latest[3]} in {latest[2]}"))
+            if latest is None or end > latest[1]:
+                latest = (start, end, slot, label)
+
+    # 2) One pass over the courses
+    hours_per_lecture = lecture_slot_hours(slots)
+    has_hs205 = False
+    for c in courses:
+        code = course_code(c)
+        if not code:
+            continue
+        if code.upper() == "HS205":
+            has_hs205 = True
+            continue
+        if code in elective_codes:
+            continue
+        L, T, P, _, _ = parse_credits(c.get("Credits (L-T-P-S-C)", "0-0-0-0-0"))
+        expected = {
+            "lecture": math.ceil(L / hours_per_lecture - 1e-9) if L > 0 else 0,
+            "lab": P // 2 if P >= 2 else P,
+            "tutorial": T,
+        }
+        for kind, need in expected.items():
+            got = counts.get((code, kind), 0)
+            if got != need:
+                if kind == "lecture":
+                    detail = f"{got} lecture slots placed, L={L} needs {need} of {hours_per_lecture:g}h"
+                elif kind == "lab":
+                    detail = f"{got} lab slots placed, P={P} needs {need}"
+                else:
+                    detail = f"{got} tutorial slots placed, T={T} needs {need}"
+                violations.append(_violation(f"{kind}_count", code, detail=detail))
+
+    if has_hs205 and hs205_slot:
+        wanted = slots.get("hs205_days")
+        if not hs205_days:
+            violations.append(_violation("hs205_placement", "HS205", detail="HS205 not placed"))
+        elif wanted and sorted(hs205_days) != sorted(wanted):
+            violations.append(_violation("hs205_placement", "HS205",
+                                         detail=f"on {', '.join(hs205_days)}, expected {', '.join(wanted)}"))
+        elif not wanted and len(hs205_days) != 1:
+            violations.append(_violation("hs205_placement", "HS205",
+                                         detail=f"on {len(hs205_days)} days, expected one"))
+
+    # 3) Electives: one pass over the enrolments
+    if enrolments:
+        for code in sorted(elective_codes - set(elective_slot)):
+            violations.append(_violation("elective_unplaced", code, detail="no minor slot"))
+        by_code = {course_code(c): c for c in courses}
+        hours = minor_slot_hours(slots)
+        for code, got in sorted(elective_days.items()):
+            need = elective_sessions(by_code[code], hours) if code in by_code else len(DAYS)
+            if got != need:
+                violations.append(_violation("elective_count", code,
+                                             detail=f"meets on {got} days, its credits need {need}"))
+        for student, chosen in enrolments.items():
+            taken = {}
+            for code in set(chosen):
+                slot = elective_slot.get(code)
+                if slot is None:
+                    continue
+                if slot in taken:
+                    violations.append(_violation("double_booked", code, slot=slot,
+                                                 detail=f"student {student} also takes {taken[slot]} then"))
+                else:
+                    taken[slot] = code
+
+    return violations
+
+
+def count_by_kind(violations):
+    counts = {}
+    for v in violations:
+        counts[v["kind"]] = counts.get(v["kind"], 0) + 1
+    return counts